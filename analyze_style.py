@@ -1,16 +1,41 @@
 #!/usr/bin/env python3
 """Analyze style profile images and save the profile."""
 
+import argparse
+import hashlib
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import orjson
 from dotenv import load_dotenv
 from src.vision import StyleAnalyzer
+from src.vision.style_analyzer import PARSE_FAILED_SUMMARY, StyleProfile
 
 load_dotenv()
 
 
+def _file_digest(path: Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "blake2b").hexdigest()
+
+
+def images_digest(paths: list[Path]) -> str:
+    """Digest of the image contents, independent of file names and order."""
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        digests = sorted(executor.map(_file_digest, paths))
+    return hashlib.blake2b("\n".join(digests).encode("utf-8")).hexdigest()
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Build a style profile from reference images")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-analyze even if the reference images haven't changed",
+    )
+    args = parser.parse_args()
+
     style_dir = Path("data/style_profiles")
 
     # Find all images in style_profiles directory
@@ -30,13 +55,25 @@ def main():
     for p in image_paths:
         print(f"  - {p.name}")
 
-    print("\nAnalyzing your style...")
     analyzer = StyleAnalyzer()
-    profile = analyzer.analyze_style_images(image_paths)
-
-    # Save profile
     profile_path = style_dir / "profile.json"
-    analyzer.save_profile(profile, profile_path)
+    digest = images_digest(image_paths)
+
+    # The saved profile records the images it was built from; anything else
+    # (a web upload, a failed parse) has no matching digest and is redone
+    saved = orjson.loads(profile_path.read_bytes()) if profile_path.exists() else {}
+
+    # The same images produce the same profile, so skip the API call
+    if not args.force and saved.get("images_digest") == digest:
+        print("\nReference images unchanged, reusing saved profile (use --force to re-analyze)")
+        profile = StyleProfile.from_dict(saved)
+    else:
+        print("\nAnalyzing your style...")
+        profile = analyzer.analyze_style_images(image_paths)
+
+        # Save profile; a placeholder from a failed parse must not be reused
+        parsed = profile.summary != PARSE_FAILED_SUMMARY
+        analyzer.save_profile(profile, profile_path, images_digest=digest if parsed else None)
 
     print("\n" + "=" * 60)
     print("YOUR STYLE PROFILE")
@@ -2,13 +2,19 @@
 
 import os
 import sys
-import json
+import hashlib
 import uuid
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 
-from flask import Flask, request, jsonify
+import orjson
+from flask import Flask, Response, request, jsonify
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
+from werkzeug.utils import secure_filename
 
 # Add project root to path so we can import from src/
 PROJECT_ROOT = Path(__file__).parent.parent
@@ -16,13 +22,25 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 from src.vision.style_analyzer import StyleAnalyzer, StyleProfile
 from src.vision.product_matcher import ProductMatcher, MatchResult
-from src.models.product import Product
+from src.models.product import Product, iter_product_records
 from backend.models import (
-    init_db, get_all_products, save_products,
+    init_db, get_all_products, iter_all_products, get_products_page, save_products,
     get_user_by_email, save_user_profile, save_user_matches,
+    get_cached_matches, save_cached_matches,
 )
 
+class OrjsonProvider(JSONProvider):
+    """Serve jsonify() responses through orjson instead of the stdlib encoder."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app)
 
 # Initialize database tables on startup
@@ -40,34 +58,139 @@ UPLOAD_DIR = DATA_DIR / "uploads"
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
 ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".gif"}
+UPLOAD_SAVE_WORKERS = 4
+UPLOAD_BUFFER_SIZE = 1 << 20  # phone photos are several MB; copy in 1 MB chunks
+MAX_PAGE_SIZE = 500
+
+# Read-only endpoints whose responses get an ETag and can answer 304
+CONDITIONAL_ENDPOINTS = {"get_products", "get_recommendations", "get_profile"}
 
 
 def allowed_file(filename: str) -> bool:
     return Path(filename).suffix.lower() in ALLOWED_EXTENSIONS
 
 
+def upload_filename(index: int, filename: str) -> str:
+    """Safe on-disk name for an upload, keeping its (validated) extension."""
+    path = Path(filename)
+    stem = secure_filename(path.stem) or "image"
+    return f"{index:02d}_{stem}{path.suffix.lower()}"
+
+
+@lru_cache(maxsize=16)
+def _parse_json_file(path: Path, mtime_ns: int, size: int):
+    return orjson.loads(path.read_bytes())
+
+
+def _load_json(path: Path):
+    """Parse a JSON file, reusing the result until the file changes on disk.
+
+    The returned object is shared between requests and must not be mutated.
+    """
+    stat = path.stat()
+    return _parse_json_file(path, stat.st_mtime_ns, stat.st_size)
+
+
+def _file_response(path: Path, build: Callable[[os.stat_result], Response]) -> Response:
+    """Serve a file-backed response with an ETag taken from the file's mtime/size.
+
+    Clients whose copy is current get a 304 without the file being read;
+    otherwise ``build`` makes the response from the file's stat result.
+    """
+    stat = path.stat()
+    etag = f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = build(stat)
+    response.set_etag(etag)
+    return response
+
+
+def _json_file_response(path: Path):
+    """Serve a JSON file, answering 304 from its mtime/size without reading it."""
+    return _file_response(
+        path, lambda stat: jsonify(_parse_json_file(path, stat.st_mtime_ns, stat.st_size))
+    )
+
+
+@app.after_request
+def add_conditional_headers(response):
+    """Let clients revalidate unchanged GET responses instead of refetching."""
+    if request.method != "GET" or request.endpoint not in CONDITIONAL_ENDPOINTS:
+        return response
+    if response.status_code not in (200, 304):
+        return response
+    # Always revalidate: data changes whenever scraping or matching runs
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    if response.status_code == 200 and not response.is_streamed:
+        response.add_etag()
+        response.make_conditional(request)
+    return response
+
+
+def _jsonl_products_response(path: Path):
+    """Stream a products JSONL file as JSON, answering 304 from its mtime/size."""
+    def stream(stat: os.stat_result) -> Response:
+        records = iter_product_records(path)
+        return Response(
+            _stream_products(next(records, None), records),
+            mimetype="application/json",
+        )
+
+    return _file_response(path, stream)
+
+
+def _stream_products(first: dict | None, rest):
+    """Encode products as a JSON object one row at a time."""
+    yield b'{"products": ['
+    total = 0
+    if first is not None:
+        yield orjson.dumps(first)
+        total = 1
+        for product in rest:
+            yield b", " + orjson.dumps(product)
+            total += 1
+    yield f'], "total_products": {total}}}'.encode("utf-8")
+
+
 # ── GET /api/products ──────────────────────────────────────────────
 @app.route("/api/products", methods=["GET"])
 def get_products():
-    """Return products from database, falling back to JSON file."""
-    if os.environ.get("DATABASE_URL"):
+    """Return products from database, falling back to JSON file.
+
+    Pass ``limit`` (and then ``cursor`` from the previous response's
+    ``next_cursor``) to page through the database instead of listing all.
+    """
+    limit = request.args.get("limit", type=int)
+    cursor = request.args.get("cursor")
+    if os.environ.get("DATABASE_URL") and (limit or cursor):
         try:
-            products = get_all_products()
-            return jsonify({
-                "total_products": len(products),
-                "products": products,
-            })
+            products, next_cursor = get_products_page(
+                max(1, min(limit or MAX_PAGE_SIZE, MAX_PAGE_SIZE)), cursor
+            )
+            return jsonify({"products": products, "next_cursor": next_cursor})
+        except ValueError:
+            return jsonify({"error": "Invalid cursor"}), 400
+        except Exception as e:
+            print(f"Database read failed, falling back to JSON: {e}")
+    elif os.environ.get("DATABASE_URL"):
+        try:
+            rows = iter_all_products()
+            # Pull the first row eagerly so DB errors still fall back to JSON
+            first = next(rows, None)
+            return Response(
+                _stream_products(first, rows), mimetype="application/json"
+            )
         except Exception as e:
             print(f"Database read failed, falling back to JSON: {e}")
 
-    products_file = SCRAPED_DIR / "latest_arrivals.json"
+    products_file = SCRAPED_DIR / "latest_arrivals.jsonl.gz"
     if not products_file.exists():
         return jsonify({"error": "No products found. Run scrapers first."}), 404
 
-    with open(products_file) as f:
-        data = json.load(f)
-
-    return jsonify(data)
+    return _jsonl_products_response(products_file)
 
 
 # ── GET /api/recommendations ──────────────────────────────────────
@@ -78,10 +201,7 @@ def get_recommendations():
     if not recs_file.exists():
         return jsonify({"error": "No recommendations found. Run matching first."}), 404
 
-    with open(recs_file) as f:
-        data = json.load(f)
-
-    return jsonify(data)
+    return _json_file_response(recs_file)
 
 
 # ── GET /api/profile ──────────────────────────────────────────────
@@ -92,10 +212,7 @@ def get_profile():
     if not profile_file.exists():
         return jsonify({"error": "No style profile found."}), 404
 
-    with open(profile_file) as f:
-        data = json.load(f)
-
-    return jsonify(data)
+    return _json_file_response(profile_file)
 
 
 # ── POST /api/analyze-style ──────────────────────────────────────
@@ -114,13 +231,17 @@ def analyze_style():
     session_dir = UPLOAD_DIR / session_id
     session_dir.mkdir(parents=True, exist_ok=True)
 
-    saved_paths = []
-    for f in files:
-        if f.filename and allowed_file(f.filename):
-            filename = f"{len(saved_paths):02d}_{Path(f.filename).name}"
-            filepath = session_dir / filename
-            f.save(filepath)
-            saved_paths.append(filepath)
+    valid_files = [f for f in files if f.filename and allowed_file(f.filename)]
+    saved_paths = [
+        session_dir / upload_filename(i, f.filename)
+        for i, f in enumerate(valid_files)
+    ]
+    # Write uploads concurrently; file I/O releases the GIL
+    with ThreadPoolExecutor(max_workers=UPLOAD_SAVE_WORKERS) as executor:
+        list(executor.map(
+            lambda f, path: f.save(path, buffer_size=UPLOAD_BUFFER_SIZE),
+            valid_files, saved_paths,
+        ))
 
     if not saved_paths:
         return jsonify({"error": "No valid image files provided"}), 400
@@ -157,8 +278,7 @@ def find_matches():
     if not profile_file.exists():
         return jsonify({"error": "No style profile found. Analyze style first."}), 400
 
-    with open(profile_file) as f:
-        profile = StyleProfile.from_dict(json.load(f))
+    profile = StyleProfile.from_dict(_load_json(profile_file))
 
     # Load products from database, falling back to JSON
     products_data = None
@@ -171,12 +291,10 @@ def find_matches():
     if products_data is not None:
         products = [Product(**p) for p in products_data]
     else:
-        products_file = SCRAPED_DIR / "latest_arrivals.json"
+        products_file = SCRAPED_DIR / "latest_arrivals.jsonl.gz"
         if not products_file.exists():
             return jsonify({"error": "No products found. Run scrapers first."}), 400
-        with open(products_file) as f:
-            raw = json.load(f)
-        products = [Product(**p) for p in raw["products"]]
+        products = [Product(**p) for p in iter_product_records(products_file)]
 
     # Get parameters from request body
     body = request.get_json(silent=True) or {}
@@ -185,21 +303,33 @@ def find_matches():
 
     try:
         matcher = ProductMatcher(profile)
-        results = matcher.match_products(
-            products, min_score=min_score, limit=limit
-        )
-
-        recommendations = {
-            "generated_at": datetime.now().isoformat(),
-            "style_summary": profile.summary,
-            "products_analyzed": min(limit, len(products)),
-            "matches_found": len(results),
-            "recommendations": [r.to_dict() for r in results],
-        }
-
-        # Cache results to file
-        with open(SCRAPED_DIR / "recommendations.json", "w") as f:
-            json.dump(recommendations, f, indent=2)
+        keys = [matcher.cache_key(p) for p in products]
+
+        # Identical profile, products and parameters give identical results
+        inputs_hash = hashlib.blake2b(
+            orjson.dumps([limit, min_score, sorted(keys)]), digest_size=16
+        ).hexdigest()
+
+        recs_file = SCRAPED_DIR / "recommendations.json"
+        recommendations = None
+        if recs_file.exists():
+            previous = _load_json(recs_file)
+            if previous.get("inputs_hash") == inputs_hash:
+                recommendations = previous
+
+        if recommendations is None:
+            recommendations = _match_and_cache(
+                matcher, products, keys, limit, min_score
+            )
+            # Products that failed (rate limits, timeouts) deserve a retry,
+            # so only a complete run may be served again for these inputs
+            if not matcher.products_unscored:
+                recommendations["inputs_hash"] = inputs_hash
+
+            # Cache results to file
+            recs_file.write_bytes(
+                orjson.dumps(recommendations, option=orjson.OPT_INDENT_2)
+            )
 
         # Persist to DB if email provided
         email = body.get("email", "").strip()
@@ -214,6 +344,44 @@ def find_matches():
         return jsonify({"error": str(e)}), 500
 
 
+def _match_and_cache(
+    matcher: ProductMatcher,
+    products: list[Product],
+    keys: list[str],
+    limit: int,
+    min_score: int,
+) -> dict:
+    """Run matching, reusing and storing per-product scores in the DB cache."""
+    # Reuse scores from earlier runs so unchanged products skip the LLM
+    cached = {}
+    if os.environ.get("DATABASE_URL"):
+        try:
+            cached = get_cached_matches(keys)
+        except Exception as e:
+            print(f"Match cache read failed: {e}")
+    matcher.cache = dict(cached)
+
+    results = matcher.match_products(
+        products, min_score=min_score, limit=limit
+    )
+
+    if os.environ.get("DATABASE_URL"):
+        try:
+            save_cached_matches({
+                k: v for k, v in matcher.cache.items() if k not in cached
+            })
+        except Exception as e:
+            print(f"Match cache write failed: {e}")
+
+    return {
+        "generated_at": datetime.now().isoformat(),
+        "style_summary": matcher.profile.summary,
+        "products_analyzed": matcher.products_scored,
+        "matches_found": len(results),
+        "recommendations": [r.to_dict() for r in results],
+    }
+
+
 # ── POST /api/admin/scrape-sezane ─────────────────────────────────
 @app.route("/api/admin/scrape-sezane", methods=["POST"])
 def scrape_and_save():
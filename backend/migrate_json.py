@@ -1,6 +1,5 @@
-"""Migrate products from JSON files into the Postgres database."""
+"""Migrate products from the scraped JSONL file into the Postgres database."""
 
-import json
 import sys
 from pathlib import Path
 
@@ -9,23 +8,21 @@ PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
 from backend.models import init_db, save_products
+from src.models.product import iter_product_records, read_products_meta
 
 
 def migrate(json_path: str | None = None) -> None:
-    path = Path(json_path) if json_path else PROJECT_ROOT / "data" / "scraped_items" / "latest_arrivals.json"
+    path = Path(json_path) if json_path else PROJECT_ROOT / "data" / "scraped_items" / "latest_arrivals.jsonl.gz"
 
     if not path.exists():
         print(f"File not found: {path}")
         sys.exit(1)
 
-    with open(path) as f:
-        data = json.load(f)
-
-    products = data.get("products", [])
-    scraped_at = data.get("scraped_at")
+    products = list(iter_product_records(path))
+    scraped_at = read_products_meta(path).get("scraped_at")
 
     if not products:
-        print("No products found in JSON file.")
+        print("No products found in JSONL file.")
         sys.exit(1)
 
     print(f"Found {len(products)} products in {path.name}")
@@ -1,11 +1,18 @@
 """Database models and helpers for the AI Shopping Agent."""
 
 import os
+from collections.abc import Iterator
 from datetime import datetime
+from functools import lru_cache
 
-from sqlalchemy import String, Text, Float, DateTime, create_engine, ARRAY
+from sqlalchemy import (
+    String, Text, Float, DateTime, Index, create_engine, select, tuple_, ARRAY,
+)
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, Session
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import JSONB, insert
+
+
+UPSERT_CHUNK_SIZE = 1000
 
 
 class Base(DeclarativeBase):
@@ -56,71 +63,180 @@ class Product(Base):
         }
 
 
+# Serves the newest-first listing; id breaks ties within one scrape run
+products_scraped_at_index = Index(
+    "ix_products_scraped_at_id", Product.scraped_at.desc(), Product.id.desc()
+)
+
+
+class MatchCache(Base):
+    __tablename__ = "match_cache"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    result: Mapped[dict] = mapped_column(JSONB)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+@lru_cache(maxsize=None)
+def _create_engine(database_url: str):
+    return create_engine(
+        database_url,
+        pool_size=10,
+        max_overflow=20,
+        pool_pre_ping=True,   # drop connections Railway closed while idle
+        pool_recycle=1800,
+    )
+
+
 def get_engine():
-    """Create a SQLAlchemy engine from DATABASE_URL."""
+    """Return the process-wide SQLAlchemy engine for DATABASE_URL.
+
+    The engine (and its connection pool) is created on first use and shared
+    by every later call, so requests reuse open connections.
+    """
     database_url = os.environ.get("DATABASE_URL", "")
     if not database_url:
         raise RuntimeError("DATABASE_URL environment variable is not set")
     # Railway uses postgres:// but SQLAlchemy 2.0 requires postgresql://
     if database_url.startswith("postgres://"):
         database_url = database_url.replace("postgres://", "postgresql://", 1)
-    return create_engine(database_url)
+    return _create_engine(database_url)
 
 
 def init_db() -> None:
     """Create all tables if they don't exist."""
     engine = get_engine()
     Base.metadata.create_all(engine)
+    # create_all skips existing tables, so add indexes introduced later
+    products_scraped_at_index.create(engine, checkfirst=True)
 
 
 def save_products(products: list[dict], scraped_at: str | None = None) -> int:
     """Upsert products into the database. Returns count of saved products."""
+    if not products:
+        return 0
     engine = get_engine()
     ts = datetime.fromisoformat(scraped_at) if scraped_at else datetime.utcnow()
-    saved = 0
 
+    # One row per URL: Postgres rejects an ON CONFLICT that hits a row twice
+    rows = {
+        p["url"]: {
+            "name": p["name"],
+            "price": p["price"],
+            "url": p["url"],
+            "image_url": p["image_url"],
+            "retailer": p["retailer"],
+            "category": p.get("category"),
+            "colors": p.get("colors", []),
+            "sizes": p.get("sizes", []),
+            "description": p.get("description"),
+            "scraped_at": ts,
+        }
+        for p in products
+    }
+
+    values = list(rows.values())
     with Session(engine) as session:
-        for p in products:
-            existing = session.query(Product).filter_by(url=p["url"]).first()
-            if existing:
-                existing.name = p["name"]
-                existing.price = p["price"]
-                existing.image_url = p["image_url"]
-                existing.retailer = p["retailer"]
-                existing.category = p.get("category")
-                existing.colors = p.get("colors", [])
-                existing.sizes = p.get("sizes", [])
-                existing.description = p.get("description")
-                existing.scraped_at = ts
-            else:
-                session.add(Product(
-                    name=p["name"],
-                    price=p["price"],
-                    url=p["url"],
-                    image_url=p["image_url"],
-                    retailer=p["retailer"],
-                    category=p.get("category"),
-                    colors=p.get("colors", []),
-                    sizes=p.get("sizes", []),
-                    description=p.get("description"),
-                    scraped_at=ts,
-                ))
-            saved += 1
+        # Chunked to stay well under Postgres' 65535 bind-parameter limit
+        for i in range(0, len(values), UPSERT_CHUNK_SIZE):
+            stmt = insert(Product).values(values[i:i + UPSERT_CHUNK_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Product.url],
+                set_={c.name: c for c in stmt.excluded if c.name not in ("id", "url")},
+            )
+            session.execute(stmt)
         session.commit()
 
-    return saved
+    return len(rows)
+
+
+# Read-only product listings select plain columns instead of hydrating ORM
+# objects, which skips identity-map bookkeeping for every row
+PRODUCT_COLUMNS = (
+    Product.id, Product.name, Product.price, Product.url, Product.image_url,
+    Product.retailer, Product.category, Product.colors, Product.sizes,
+    Product.description, Product.scraped_at,
+)
+
+
+def _product_row_to_dict(row) -> dict:
+    """Same shape as Product.to_dict, built from a column mapping."""
+    data = dict(row)
+    data["colors"] = data["colors"] or []
+    data["sizes"] = data["sizes"] or []
+    data["scraped_at"] = data["scraped_at"].isoformat() if data["scraped_at"] else None
+    return data
 
 
 def get_all_products() -> list[dict]:
     """Fetch all products ordered by most recently scraped."""
     engine = get_engine()
+    stmt = select(*PRODUCT_COLUMNS).order_by(Product.scraped_at.desc(), Product.id.desc())
     with Session(engine) as session:
-        products = (
-            session.query(Product)
-            .order_by(Product.scraped_at.desc())
-            .all()
+        return [_product_row_to_dict(r) for r in session.execute(stmt).mappings()]
+
+
+def iter_all_products(batch_size: int = 500) -> Iterator[dict]:
+    """Yield products newest first, loading rows from the DB in batches."""
+    engine = get_engine()
+    stmt = (
+        select(*PRODUCT_COLUMNS)
+        .order_by(Product.scraped_at.desc(), Product.id.desc())
+        .execution_options(yield_per=batch_size)
+    )
+    with Session(engine) as session:
+        for row in session.execute(stmt).mappings():
+            yield _product_row_to_dict(row)
+
+
+def get_products_page(limit: int, cursor: str | None = None) -> tuple[list[dict], str | None]:
+    """Fetch one page of products newest first using keyset pagination.
+
+    ``cursor`` is the ``next_cursor`` returned with the previous page. Returns
+    the page and the cursor for the following one (None on the last page).
+    Raises ValueError for a malformed cursor.
+    """
+    stmt = select(*PRODUCT_COLUMNS)
+    if cursor:
+        ts, _, last_id = cursor.rpartition("_")
+        stmt = stmt.where(
+            tuple_(Product.scraped_at, Product.id)
+            < (datetime.fromisoformat(ts), int(last_id))
         )
-        return [p.to_dict() for p in products]
+    stmt = stmt.order_by(Product.scraped_at.desc(), Product.id.desc()).limit(limit)
+
+    engine = get_engine()
+    with Session(engine) as session:
+        rows = session.execute(stmt).mappings().all()
+
+    next_cursor = None
+    if len(rows) == limit:
+        last = rows[-1]
+        next_cursor = f"{last['scraped_at'].isoformat()}_{last['id']}"
+    return [_product_row_to_dict(r) for r in rows], next_cursor
+
+
+def get_cached_matches(keys: list[str]) -> dict[str, dict]:
+    """Return cached match results for the given keys (missing keys omitted)."""
+    if not keys:
+        return {}
+    engine = get_engine()
+    with Session(engine) as session:
+        rows = session.query(MatchCache).filter(MatchCache.key.in_(keys)).all()
+        return {row.key: row.result for row in rows}
+
+
+def save_cached_matches(results: dict[str, dict]) -> None:
+    """Store match results by cache key, keeping any existing entries."""
+    if not results:
+        return
+    engine = get_engine()
+    stmt = insert(MatchCache).values(
+        [{"key": k, "result": v, "created_at": datetime.utcnow()} for k, v in results.items()]
+    ).on_conflict_do_nothing(index_elements=["key"])
+    with Session(engine) as session:
+        session.execute(stmt)
+        session.commit()
 
 
 def get_user_by_email(email: str) -> dict | None:
@@ -1,38 +1,18 @@
 #!/usr/bin/env python3
 """Find products that match your style profile."""
 
-import json
 import os
 import sys
 from pathlib import Path
+import orjson
 from dotenv import load_dotenv
-from src.vision import StyleAnalyzer, ProductMatcher
-from src.models.product import Product
+from src.vision import StyleAnalyzer, ProductMatcher, DiskMatchCache
+from src.vision.product_matcher import MAX_BATCH_SIZE
+from src.models.product import iter_products
 
 load_dotenv()
 
 
-def load_products(path: Path) -> list[Product]:
-    """Load products from JSON file."""
-    with open(path) as f:
-        data = json.load(f)
-
-    products = []
-    for p in data.get("products", []):
-        products.append(Product(
-            name=p["name"],
-            price=p["price"],
-            url=p["url"],
-            image_url=p["image_url"],
-            retailer=p["retailer"],
-            category=p.get("category"),
-            colors=p.get("colors", []),
-            sizes=p.get("sizes", []),
-            description=p.get("description"),
-        ))
-    return products
-
-
 def main():
     # Load style profile
     profile_path = Path("data/style_profiles/profile.json")
@@ -48,32 +28,38 @@ def main():
     print(f"  {profile.summary}\n")
 
     # Load scraped products
-    products_path = Path("data/scraped_items/latest_arrivals.json")
+    products_path = Path("data/scraped_items/latest_arrivals.jsonl.gz")
     if not products_path.exists():
         print("No scraped products found. Run run_scrapers.py first.")
         sys.exit(1)
 
-    products = load_products(products_path)
+    products = list(iter_products(products_path))
     print(f"Loaded {len(products)} products\n")
 
-    # Match products
-    matcher = ProductMatcher(profile)
-
     # For demo, limit to first 20 products (API calls cost money)
     # Adjust limit as needed
     import argparse
     parser = argparse.ArgumentParser()
     parser.add_argument("--limit", type=int, default=20, help="Max products to analyze")
     parser.add_argument("--min-score", type=int, default=6, help="Minimum match score (1-10)")
+    parser.add_argument(
+        "--batch-size", type=int, default=8, choices=range(1, MAX_BATCH_SIZE + 1),
+        metavar=f"1-{MAX_BATCH_SIZE}", help="Products scored per Claude call",
+    )
     parser.add_argument("--all", action="store_true", help="Analyze all products (can be slow/expensive)")
+    parser.add_argument("--no-cache", action="store_true", help="Re-score products instead of reusing cached scores")
     args = parser.parse_args()
 
+    # Match products
+    matcher = ProductMatcher(profile, cache=None if args.no_cache else DiskMatchCache())
+
     limit = None if args.all else args.limit
 
     results = matcher.match_products(
         products,
         min_score=args.min_score,
         limit=limit,
+        batch_size=args.batch_size,
     )
 
     # Display results
@@ -95,14 +81,13 @@ def main():
 
     # Save results
     output_path = Path("data/scraped_items/matched_products.json")
-    with open(output_path, "w") as f:
-        json.dump({
-            "style_summary": profile.summary,
-            "total_analyzed": limit or len(products),
-            "matches_found": len(results),
-            "min_score_threshold": args.min_score,
-            "results": [r.to_dict() for r in results],
-        }, f, indent=2)
+    output_path.write_bytes(orjson.dumps({
+        "style_summary": profile.summary,
+        "total_analyzed": matcher.products_scored,
+        "matches_found": len(results),
+        "min_score_threshold": args.min_score,
+        "results": [r.to_dict() for r in results],
+    }, option=orjson.OPT_INDENT_2))
 
     print(f"\nResults saved to: {output_path}")
 
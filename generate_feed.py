@@ -1,12 +1,15 @@
 #!/usr/bin/env python3
 """Generate a beautiful HTML product feed from recommendations."""
 
-import json
 import html
+import re
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 from string import Template
 
+import orjson
+
 
 CSS = """
         * {
@@ -265,13 +268,105 @@ CSS = """
 """
 
 
+def minify_css(css: str) -> str:
+    """Collapse the whitespace in a stylesheet."""
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{}:;,>])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+MINIFIED_CSS = minify_css(CSS)
+CSS_FILENAME = "feed.css"
+
+
+def write_stylesheet(directory: Path) -> None:
+    """Write the shared feed stylesheet next to the feeds, if it changed."""
+    css_path = directory / CSS_FILENAME
+    if not css_path.exists() or css_path.read_text() != MINIFIED_CSS:
+        css_path.write_text(MINIFIED_CSS)
+
+
+CARD_TEMPLATE = Template("""
+            <article class="card">
+                <div class="card-image">
+                    $image_html
+                    <div class="score-badge$score_class">
+                        $score/10
+                        <div class="score-dots">
+                            $dots
+                        </div>
+                    </div>
+                </div>
+                <div class="card-content">
+                    <div class="card-header">
+                        <h2 class="product-name">$name</h2>
+                        <span class="product-price">$price</span>
+                    </div>
+                    <p class="retailer">$retailer</p>
+                    <p class="reasoning">$reasoning</p>
+                    <a href="$url" target="_blank" rel="noopener" class="buy-link">View Product</a>
+                </div>
+            </article>""")
+
+PAGE_TEMPLATE = Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Your Curated Picks</title>
+    $styles
+</head>
+<body>
+    <div class="container">
+        <header>
+            <h1>Your Curated Picks</h1>
+            <p class="subtitle">$style_summary</p>
+            <div class="stats">
+                <div class="stat">
+                    <div class="stat-value">$match_count</div>
+                    <div class="stat-label">Matches Found</div>
+                </div>
+                <div class="stat">
+                    <div class="stat-value">$top_score/10</div>
+                    <div class="stat-label">Best Score</div>
+                </div>
+                <div class="stat">
+                    <div class="stat-value">$avg_score</div>
+                    <div class="stat-label">Avg Score</div>
+                </div>
+            </div>
+            <p class="meta">Generated $generated_date</p>
+        </header>
+
+        <div class="grid">
+$product_cards
+        </div>
+
+        <footer>
+            Curated by AI Shopping Agent · Powered by Claude Vision
+        </footer>
+    </div>
+</body>
+</html>
+""")
+
+# Score indicator rows for every possible score, indexed by score
+_DOT_ROWS = tuple(
+    "\n                            ".join(
+        f'<span class="dot{" filled" if i < score else ""}"></span>'
+        for i in range(10)
+    )
+    for score in range(11)
+)
+
+
+# Retailer names repeat on every card; escape each distinct one once
+_escape_retailer = lru_cache(maxsize=64)(html.escape)
+
+
 def generate_dots(score: int) -> str:
     """Generate score indicator dots."""
-    dots = []
-    for i in range(10):
-        filled = " filled" if i < score else ""
-        dots.append(f'<span class="dot{filled}"></span>')
-    return "\n                            ".join(dots)
+    return _DOT_ROWS[max(0, min(10, int(score)))]
 
 
 def generate_card(result: dict) -> str:
@@ -284,7 +379,7 @@ def generate_card(result: dict) -> str:
         price = "Price on site"
     price = html.escape(str(price))
 
-    retailer = html.escape(product.get("retailer", ""))
+    retailer = _escape_retailer(product.get("retailer", ""))
     url = html.escape(product.get("url", "#"))
     image_url = product.get("image_url", "")
 
@@ -297,49 +392,33 @@ def generate_card(result: dict) -> str:
     else:
         image_html = '<div class="no-image">No image available</div>'
 
-    # Score class for styling
-    score_class = " excellent" if score >= 9 else ""
-
-    # Generate dots
-    dots = generate_dots(score)
+    return CARD_TEMPLATE.substitute(
+        image_html=image_html,
+        score_class=" excellent" if score >= 9 else "",
+        score=score,
+        dots=generate_dots(score),
+        name=name,
+        price=price,
+        retailer=retailer,
+        reasoning=reasoning,
+        url=url,
+    )
 
-    return f"""
-            <article class="card">
-                <div class="card-image">
-                    {image_html}
-                    <div class="score-badge{score_class}">
-                        {score}/10
-                        <div class="score-dots">
-                            {dots}
-                        </div>
-                    </div>
-                </div>
-                <div class="card-content">
-                    <div class="card-header">
-                        <h2 class="product-name">{name}</h2>
-                        <span class="product-price">{price}</span>
-                    </div>
-                    <p class="retailer">{retailer}</p>
-                    <p class="reasoning">{reasoning}</p>
-                    <a href="{url}" target="_blank" rel="noopener" class="buy-link">View Product</a>
-                </div>
-            </article>"""
 
+def generate_feed(input_path: Path, output_path: Path, inline_css: bool = False):
+    """Generate HTML feed from recommendations JSON.
 
-def generate_feed(input_path: Path, output_path: Path):
-    """Generate HTML feed from recommendations JSON."""
-    with open(input_path) as f:
-        data = json.load(f)
+    The stylesheet is written once as feed.css beside the output and linked,
+    so browsers cache it across feeds; ``inline_css`` embeds it instead for a
+    single self-contained file.
+    """
+    data = orjson.loads(input_path.read_bytes())
 
     results = data.get("recommendations", []) or data.get("results", [])
     if not results:
         print("No results found in recommendations.json")
         return
 
-    # Generate cards
-    cards = [generate_card(r) for r in results]
-    product_cards = "\n".join(cards)
-
     # Calculate stats
     scores = [r.get("score", 0) for r in results]
     top_score = max(scores) if scores else 0
@@ -356,51 +435,21 @@ def generate_feed(input_path: Path, output_path: Path):
     else:
         generated_date = datetime.now().strftime("%B %d, %Y at %I:%M %p")
 
-    style_summary = html.escape(data.get("style_summary", ""))
-
-    # Build final HTML
-    html_content = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Your Curated Picks</title>
-    <style>{CSS}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <header>
-            <h1>Your Curated Picks</h1>
-            <p class="subtitle">{style_summary}</p>
-            <div class="stats">
-                <div class="stat">
-                    <div class="stat-value">{len(results)}</div>
-                    <div class="stat-label">Matches Found</div>
-                </div>
-                <div class="stat">
-                    <div class="stat-value">{top_score}/10</div>
-                    <div class="stat-label">Best Score</div>
-                </div>
-                <div class="stat">
-                    <div class="stat-value">{avg_score}</div>
-                    <div class="stat-label">Avg Score</div>
-                </div>
-            </div>
-            <p class="meta">Generated {generated_date}</p>
-        </header>
-
-        <div class="grid">
-{product_cards}
-        </div>
-
-        <footer>
-            Curated by AI Shopping Agent · Powered by Claude Vision
-        </footer>
-    </div>
-</body>
-</html>
-"""
+    if inline_css:
+        styles = f"<style>{MINIFIED_CSS}</style>"
+    else:
+        write_stylesheet(output_path.parent)
+        styles = f'<link rel="stylesheet" href="{CSS_FILENAME}">'
+
+    html_content = PAGE_TEMPLATE.substitute(
+        styles=styles,
+        style_summary=html.escape(data.get("style_summary", "")),
+        match_count=len(results),
+        top_score=top_score,
+        avg_score=avg_score,
+        generated_date=generated_date,
+        product_cards="\n".join(generate_card(r) for r in results),
+    )
 
     with open(output_path, "w") as f:
         f.write(html_content)
@@ -425,6 +474,11 @@ def main():
         default=Path("data/feed.html"),
         help="Output HTML file",
     )
+    parser.add_argument(
+        "--inline-css",
+        action="store_true",
+        help="Embed the stylesheet instead of writing a shared feed.css",
+    )
     args = parser.parse_args()
 
     if not args.input.exists():
@@ -432,7 +486,7 @@ def main():
         print("Run shop.py first to generate recommendations.")
         return
 
-    generate_feed(args.input, args.output)
+    generate_feed(args.input, args.output, inline_css=args.inline_css)
 
 
 if __name__ == "__main__":
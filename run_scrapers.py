@@ -1,23 +1,44 @@
 #!/usr/bin/env python3
 """Test script to run scrapers and see extracted data."""
 
-import json
-from datetime import datetime
-from src.scrapers import SezaneScraper, ArketScraper
+import argparse
+import asyncio
+from src.scrapers import (
+    SezaneScraper, ArketScraper, PageCache, close_browser_context, close_shared_client,
+)
+from src.models.product import save_products_jsonl
+
+
+async def scrape_concurrently(cache: PageCache | None = None) -> tuple[list, list]:
+    """Scrape Sezane (HTTP) and Arket (browser) at the same time."""
+    sezane = SezaneScraper(cache=cache)
+    arket = ArketScraper(cache=cache)
+    try:
+        async with asyncio.TaskGroup() as tg:
+            sezane_task = tg.create_task(sezane.scrape_new_arrivals_async())
+            arket_task = tg.create_task(arket.scrape_new_arrivals_async(debug=True))
+        return sezane_task.result(), arket_task.result()
+    finally:
+        await close_shared_client()
+        await close_browser_context()
 
 
 def main():
-    all_products = []
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--no-cache", action="store_true", help="Re-fetch pages instead of using cached HTML")
+    args = parser.parse_args()
+    cache = None if args.no_cache else PageCache()
 
-    # Scrape Sezane
     print("=" * 60)
-    print("SCRAPING SEZANE NEW ARRIVALS")
+    print("SCRAPING SEZANE + ARKET NEW ARRIVALS")
     print("=" * 60)
-    sezane = SezaneScraper()
-    sezane_products = sezane.scrape_new_arrivals()
-    all_products.extend(sezane_products)
-    sezane.close()
+    sezane_products, arket_products = asyncio.run(scrape_concurrently(cache))
+    all_products = sezane_products + arket_products
 
+    # Sezane
+    print("\n" + "=" * 60)
+    print("SEZANE NEW ARRIVALS")
+    print("=" * 60)
     print(f"\nSezane: Found {len(sezane_products)} products")
     for p in sezane_products[:5]:
         print(f"\n  Name: {p.name}")
@@ -28,15 +49,10 @@ def main():
         if p.colors:
             print(f"  Colors: {', '.join(p.colors)}")
 
-    # Scrape Arket
+    # Arket
     print("\n" + "=" * 60)
-    print("SCRAPING ARKET NEW ARRIVALS")
+    print("ARKET NEW ARRIVALS")
     print("=" * 60)
-    arket = ArketScraper()
-    arket_products = arket.scrape_new_arrivals(debug=True)
-    all_products.extend(arket_products)
-    # Browser scraper handles cleanup automatically
-
     print(f"\nArket: Found {len(arket_products)} products")
     for p in arket_products[:5]:
         print(f"\n  Name: {p.name}")
@@ -55,16 +71,9 @@ def main():
     print(f"  - Sezane: {len(sezane_products)}")
     print(f"  - Arket: {len(arket_products)}")
 
-    # Save to JSON
-    output = {
-        "scraped_at": datetime.now().isoformat(),
-        "total_products": len(all_products),
-        "products": [p.to_dict() for p in all_products]
-    }
-
-    output_path = "data/scraped_items/latest_arrivals.json"
-    with open(output_path, "w") as f:
-        json.dump(output, f, indent=2)
+    # Save as JSON Lines
+    output_path = "data/scraped_items/latest_arrivals.jsonl.gz"
+    save_products_jsonl(all_products, output_path)
     print(f"\nSaved results to {output_path}")
 
 
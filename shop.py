@@ -2,52 +2,52 @@
 """Main shopping agent - scrape and match in one command."""
 
 import argparse
-import json
+import asyncio
 import os
 from pathlib import Path
 from datetime import datetime
+import orjson
 from dotenv import load_dotenv
 
-from src.scrapers import SezaneScraper, ArketScraper
-from src.vision import StyleAnalyzer, ProductMatcher
-from src.models.product import Product
+from src.scrapers import (
+    SezaneScraper, ArketScraper, PageCache, close_browser_context, close_shared_client,
+)
+from src.vision import StyleAnalyzer, ProductMatcher, DiskMatchCache
+from src.vision.product_matcher import MAX_BATCH_SIZE
+from src.models.product import Product, iter_products, save_products_jsonl
 
 load_dotenv()
 
+SCRAPERS = {
+    "Sezane": SezaneScraper,
+    "Arket": ArketScraper,  # may return nothing due to bot protection
+}
 
-def scrape_all() -> list[Product]:
-    """Scrape all retailers and return products."""
-    all_products = []
 
+async def scrape_all_async(cache: PageCache | None = None) -> list[Product]:
+    """Scrape all retailers concurrently and return products."""
     print("Scraping new arrivals...")
 
-    # Sezane
-    print("  - Sezane...", end=" ", flush=True)
-    sezane = SezaneScraper()
-    sezane_products = sezane.scrape_new_arrivals()
-    all_products.extend(sezane_products)
-    sezane.close()
-    print(f"{len(sezane_products)} products")
-
-    # Arket (may fail due to bot protection)
-    print("  - Arket...", end=" ", flush=True)
-    arket = ArketScraper()
-    arket_products = arket.scrape_new_arrivals()
-    all_products.extend(arket_products)
-    print(f"{len(arket_products)} products")
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tasks = {
+                name: tg.create_task(scraper(cache=cache).scrape_new_arrivals_async())
+                for name, scraper in SCRAPERS.items()
+            }
+    finally:
+        await close_shared_client()
+        await close_browser_context()
 
-    return all_products
+    products = []
+    for name, task in tasks.items():
+        print(f"  - {name}: {len(task.result())} products")
+        products.extend(task.result())
+    return products
 
 
-def save_products(products: list[Product], path: Path):
-    """Save products to JSON."""
-    output = {
-        "scraped_at": datetime.now().isoformat(),
-        "total_products": len(products),
-        "products": [p.to_dict() for p in products],
-    }
-    with open(path, "w") as f:
-        json.dump(output, f, indent=2)
+def scrape_all(cache: PageCache | None = None) -> list[Product]:
+    """Scrape all retailers and return products."""
+    return asyncio.run(scrape_all_async(cache))
 
 
 def main():
@@ -82,34 +82,42 @@ def main():
         default=10,
         help="Number of top matches to display",
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=8,
+        choices=range(1, MAX_BATCH_SIZE + 1),
+        metavar=f"1-{MAX_BATCH_SIZE}",
+        help="Products scored per Claude call",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore cached retailer pages and match scores",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=int,
+        default=3600,
+        help="Seconds a cached retailer page stays fresh",
+    )
     args = parser.parse_args()
 
-    products_path = Path("data/scraped_items/latest_arrivals.json")
+    products_path = Path("data/scraped_items/latest_arrivals.jsonl.gz")
     profile_path = Path("data/style_profiles/profile.json")
 
     # Scrape products
     if not args.match_only:
-        products = scrape_all()
-        save_products(products, products_path)
+        cache = None if args.no_cache else PageCache(ttl=args.cache_ttl)
+        products = scrape_all(cache)
+        save_products_jsonl(products, products_path)
         print(f"\nTotal: {len(products)} products scraped\n")
     else:
         # Load cached products
         if not products_path.exists():
             print("No cached products. Run without --match-only first.")
             return
-        with open(products_path) as f:
-            data = json.load(f)
-        products = [
-            Product(
-                name=p["name"],
-                price=p["price"],
-                url=p["url"],
-                image_url=p["image_url"],
-                retailer=p["retailer"],
-                colors=p.get("colors", []),
-            )
-            for p in data["products"]
-        ]
+        products = list(iter_products(products_path))
         print(f"Loaded {len(products)} cached products\n")
 
     if args.scrape_only:
@@ -137,11 +145,12 @@ def main():
     profile = analyzer.load_profile(profile_path)
     print(f"\nYour style: {profile.summary}\n")
 
-    matcher = ProductMatcher(profile)
+    matcher = ProductMatcher(profile, cache=None if args.no_cache else DiskMatchCache())
     results = matcher.match_products(
         products,
         min_score=args.min_score,
         limit=args.limit,
+        batch_size=args.batch_size,
     )
 
     # Display top results
@@ -167,18 +176,16 @@ def main():
 
     # Save full results
     output_path = Path("data/scraped_items/recommendations.json")
-    with open(output_path, "w") as f:
-        json.dump(
-            {
-                "generated_at": datetime.now().isoformat(),
-                "style_summary": profile.summary,
-                "products_analyzed": args.limit,
-                "matches_found": len(results),
-                "recommendations": [r.to_dict() for r in results],
-            },
-            f,
-            indent=2,
-        )
+    output_path.write_bytes(orjson.dumps(
+        {
+            "generated_at": datetime.now().isoformat(),
+            "style_summary": profile.summary,
+            "products_analyzed": matcher.products_scored,
+            "matches_found": len(results),
+            "recommendations": [r.to_dict() for r in results],
+        },
+        option=orjson.OPT_INDENT_2,
+    ))
     print(f"\n\nFull results saved to: {output_path}")
 
 
@@ -1,5 +1,11 @@
 from .sezane import SezaneScraper
 from .arket import ArketScraper
-from .base import BaseScraper
+from .base import BaseScraper, close_shared_client, get_shared_client
+from .browser import close_browser_context
+from .cache import PageCache
 
-__all__ = ["SezaneScraper", "ArketScraper", "BaseScraper"]
+__all__ = [
+    "SezaneScraper", "ArketScraper", "BaseScraper",
+    "close_shared_client", "get_shared_client", "close_browser_context",
+    "PageCache",
+]
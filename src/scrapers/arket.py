@@ -1,54 +1,62 @@
+import asyncio
 import re
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 from ..models.product import Product
+from .dom import NodeLookup
 
 try:
-    from .browser import BrowserScraper
+    from .browser import BrowserScraper, close_browser_context
     BROWSER_AVAILABLE = True
 except ImportError:
     BROWSER_AVAILABLE = False
     BrowserScraper = object  # Fallback for type hints
 
+_AR_SLUG_RE = re.compile(r'/p/([^/?]+)')
+_AR_HTML_RE = re.compile(r'/([^/]+)\.html')
+
 
 class ArketScraper(BrowserScraper if BROWSER_AVAILABLE else object):
     """Scraper for Arket new arrivals using browser automation."""
 
     BASE_URL = "https://www.arket.com"
+    PRODUCT_SELECTOR = 'a[href*="/p/"], a[href*="/product"]'
 
-    def __init__(self):
+    def __init__(self, cache=None):
         if BROWSER_AVAILABLE:
-            super().__init__()
+            super().__init__(cache=cache)
 
     def get_new_arrivals_url(self) -> str:
         return f"{self.BASE_URL}/en-ww/women/new-arrivals/"
 
     def parse_products(self, html: str) -> list[Product]:
         """Parse Arket product listings."""
-        soup = BeautifulSoup(html, "lxml")
+        tree = LexborHTMLParser(html)
+        # Local to this parse, so its cached nodes die with the tree
+        lookup = NodeLookup()
         products = []
         seen_urls = set()
 
         # Look for product links - Arket uses various patterns
-        product_links = soup.select('a[href*="/p/"], a[href*="/product"]')
+        product_links = tree.css('a[href*="/p/"], a[href*="/product"]')
         if not product_links:
-            product_links = soup.select('[class*="product"] a[href]')
+            product_links = tree.css('[class*="product"] a[href]')
 
         print(f"Found {len(product_links)} product links")
 
         for link in product_links:
             try:
-                href = link.get("href", "")
+                href = link.attributes.get("href") or ""
                 if not href or ("/p/" not in href and "/product" not in href):
                     continue
 
                 full_url = href if href.startswith("http") else f"{self.BASE_URL}{href}"
-                base_url = full_url.split('?')[0]  # Remove query params
+                base_url = full_url.partition('?')[0]  # Remove query params
 
                 if base_url in seen_urls:
                     continue
                 seen_urls.add(base_url)
 
-                product = self._parse_product_link(link, base_url)
+                product = self._parse_product_link(link, base_url, lookup)
                 if product:
                     products.append(product)
             except Exception as e:
@@ -58,46 +66,47 @@ class ArketScraper(BrowserScraper if BROWSER_AVAILABLE else object):
         print(f"Deduplicated to {len(products)} unique products")
         return products
 
-    def _parse_product_link(self, link, url: str) -> Product | None:
+    def _parse_product_link(self, link, url: str, lookup: NodeLookup) -> Product | None:
         """Parse product from link element."""
         # Try to extract name from the link or nearby elements
         name = None
 
         # Check link text
-        link_text = link.get_text(strip=True)
+        link_text = link.text(strip=True)
         if link_text and len(link_text) > 3 and len(link_text) < 100:
             name = link_text
 
         # Check for title/name elements
         if not name:
-            name_elem = link.select_one('[class*="name"], [class*="title"], h2, h3, span')
+            name_elem = link.css_first('[class*="name"], [class*="title"], h2, h3, span')
             if name_elem:
-                name = name_elem.get_text(strip=True)
+                name = name_elem.text(strip=True)
 
         # Extract from URL as fallback
         if not name or name == "":
-            match = re.search(r'/p/([^/?]+)', url) or re.search(r'/([^/]+)\.html', url)
+            match = _AR_SLUG_RE.search(url) or _AR_HTML_RE.search(url)
             if match:
                 name = match.group(1).replace('-', ' ').title()
             else:
                 name = "Unknown"
 
         # Find image
-        img = link.find("img")
+        img = link.css_first("img")
         if not img:
             parent = link.parent
             for _ in range(3):
                 if parent:
-                    img = parent.find("img")
+                    img = lookup.css_first(parent, "img")
                     if img:
                         break
                     parent = parent.parent
 
         image_url = ""
         if img:
-            image_url = img.get("src") or img.get("data-src") or ""
-            if not image_url and img.get("srcset"):
-                image_url = img.get("srcset", "").split(",")[0].split()[0]
+            attrs = img.attributes
+            image_url = attrs.get("src") or attrs.get("data-src") or ""
+            if not image_url and attrs.get("srcset"):
+                image_url = attrs["srcset"].partition(",")[0].split()[0]
             if image_url and not image_url.startswith("http"):
                 image_url = f"https:{image_url}" if image_url.startswith("//") else f"{self.BASE_URL}{image_url}"
 
@@ -106,9 +115,9 @@ class ArketScraper(BrowserScraper if BROWSER_AVAILABLE else object):
         parent = link.parent
         for _ in range(4):
             if parent:
-                price_elem = parent.select_one('[class*="price"], [class*="Price"]')
+                price_elem = lookup.css_first(parent, '[class*="price"], [class*="Price"]')
                 if price_elem:
-                    price = price_elem.get_text(strip=True)
+                    price = price_elem.text(strip=True)
                     break
                 parent = parent.parent
 
@@ -121,16 +130,27 @@ class ArketScraper(BrowserScraper if BROWSER_AVAILABLE else object):
             colors=[],
         )
 
-    def scrape_new_arrivals(self, debug: bool = False) -> list:
+    async def scrape_new_arrivals_async(self, debug: bool = False) -> list:
         """Scrape using browser if available, otherwise return empty with message."""
         if not BROWSER_AVAILABLE:
             print("Playwright not available. Install with: pip install playwright && playwright install chromium")
             return []
-        products = super().scrape_new_arrivals(debug=debug)
+        products = await super().scrape_new_arrivals_async(debug=debug)
         if not products:
             print("Note: Arket has strong bot protection (Akamai). Consider using their mobile app API or RSS feeds.")
         return products
 
+    def scrape_new_arrivals(self, debug: bool = False) -> list:
+        """Sync wrapper for scraping."""
+        async def scrape_and_close():
+            try:
+                return await self.scrape_new_arrivals_async(debug=debug)
+            finally:
+                if BROWSER_AVAILABLE:
+                    await close_browser_context()
+
+        return asyncio.run(scrape_and_close())
+
 
 if __name__ == "__main__":
     scraper = ArketScraper()
@@ -1,39 +1,125 @@
+import asyncio
+import weakref
 from abc import ABC, abstractmethod
 import httpx
 from typing import Optional
 
+from .cache import PageCache
+
+try:
+    import h2  # noqa: F401 - enables httpx's HTTP/2 support
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate, br",
+    "Cache-Control": "no-cache",
+    "Pragma": "no-cache",
+    "Sec-Ch-Ua": '"Chromium";v="122", "Not(A:Brand";v="24", "Google Chrome";v="122"',
+    "Sec-Ch-Ua-Mobile": "?0",
+    "Sec-Ch-Ua-Platform": '"macOS"',
+    "Sec-Fetch-Dest": "document",
+    "Sec-Fetch-Mode": "navigate",
+    "Sec-Fetch-Site": "none",
+    "Sec-Fetch-User": "?1",
+    "Upgrade-Insecure-Requests": "1",
+}
+
+# An AsyncClient's connection pool is tied to the event loop it was used on,
+# so "shared" means one client per running loop
+_shared_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# Different retailers run fully in parallel; each one sees at most this many
+# requests at a time, however many scrapers or fetch_many calls target it
+MAX_REQUESTS_PER_HOST = 5
+_host_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    """Return the HTTP client shared by all scrapers on the running loop.
+
+    Reusing one client keeps connections to each retailer alive across
+    requests and scrapers instead of redoing TCP/TLS setup.
+    """
+    loop = asyncio.get_running_loop()
+    client = _shared_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            follow_redirects=True,
+            timeout=30.0,
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_keepalive_connections=32,
+                max_connections=64,
+                keepalive_expiry=30,
+            ),
+        )
+        _shared_clients[loop] = client
+    return client
+
+
+def _host_semaphore(url: str) -> asyncio.Semaphore:
+    """Semaphore bounding in-flight requests to ``url``'s host on this loop."""
+    semaphores = _host_semaphores.setdefault(asyncio.get_running_loop(), {})
+    host = httpx.URL(url).host
+    if host not in semaphores:
+        semaphores[host] = asyncio.Semaphore(MAX_REQUESTS_PER_HOST)
+    return semaphores[host]
+
+
+async def close_shared_client():
+    """Close the running loop's shared client; call once scraping is done."""
+    client = _shared_clients.pop(asyncio.get_running_loop(), None)
+    if client:
+        await client.aclose()
+
 
 class BaseScraper(ABC):
     """Base class for all retail scrapers."""
 
-    def __init__(self):
-        self.headers = {
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.9",
-            "Accept-Encoding": "gzip, deflate, br",
-            "Cache-Control": "no-cache",
-            "Pragma": "no-cache",
-            "Sec-Ch-Ua": '"Chromium";v="122", "Not(A:Brand";v="24", "Google Chrome";v="122"',
-            "Sec-Ch-Ua-Mobile": "?0",
-            "Sec-Ch-Ua-Platform": '"macOS"',
-            "Sec-Fetch-Dest": "document",
-            "Sec-Fetch-Mode": "navigate",
-            "Sec-Fetch-Site": "none",
-            "Sec-Fetch-User": "?1",
-            "Upgrade-Insecure-Requests": "1",
-        }
-        self.client = httpx.Client(headers=self.headers, follow_redirects=True, timeout=30.0)
-
-    def fetch_page(self, url: str) -> Optional[str]:
-        """Fetch HTML content from a URL."""
+    # Upper bound on in-flight requests from fetch_many
+    MAX_CONCURRENT_REQUESTS = 10
+
+    def __init__(self, cache: Optional[PageCache] = None):
+        self.cache = cache
+
+    async def fetch_page(self, url: str) -> Optional[str]:
+        """Fetch HTML content from a URL, serving it from the page cache if fresh."""
+        if self.cache:
+            html = self.cache.get(url)
+            if html is not None:
+                print(f"Using cached page: {url}")
+                return html
         try:
-            response = self.client.get(url)
+            async with _host_semaphore(url):
+                response = await get_shared_client().get(url)
             response.raise_for_status()
-            return response.text
         except httpx.HTTPError as e:
             print(f"Error fetching {url}: {e}")
             return None
+        if self.cache:
+            self.cache.set(url, response.text)
+        return response.text
+
+    async def fetch_many(self, urls: list[str]) -> list[Optional[str]]:
+        """Fetch several pages concurrently, in the order given."""
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+
+        async def fetch(url: str) -> Optional[str]:
+            async with semaphore:
+                return await self.fetch_page(url)
+
+        return await asyncio.gather(*(fetch(url) for url in urls))
 
     @abstractmethod
     def get_new_arrivals_url(self) -> str:
@@ -45,14 +131,24 @@ class BaseScraper(ABC):
         """Parse products from HTML content."""
         pass
 
-    def scrape_new_arrivals(self) -> list:
-        """Main method to scrape new arrivals."""
+    async def scrape_new_arrivals_async(self) -> list:
+        """Main async method to scrape new arrivals."""
         url = self.get_new_arrivals_url()
         print(f"Fetching: {url}")
-        html = self.fetch_page(url)
+        html = await self.fetch_page(url)
         if html:
             return self.parse_products(html)
         return []
 
+    def scrape_new_arrivals(self) -> list:
+        """Sync wrapper for scraping."""
+        async def scrape_and_close():
+            try:
+                return await self.scrape_new_arrivals_async()
+            finally:
+                await close_shared_client()
+
+        return asyncio.run(scrape_and_close())
+
     def close(self):
-        self.client.close()
+        """No-op: scrapers share a client, closed by close_shared_client()."""
@@ -1,68 +1,124 @@
 """Browser-based scraper for JavaScript-heavy sites using Playwright."""
 
 import asyncio
+import weakref
 from abc import abstractmethod
+from pathlib import Path
 from typing import Optional
 
+from .cache import PageCache
+
 try:
     from playwright.async_api import async_playwright, Page
     PLAYWRIGHT_AVAILABLE = True
 except ImportError:
     PLAYWRIGHT_AVAILABLE = False
 
+# Reused across runs so cookies and cached scripts survive between scrapes
+BROWSER_PROFILE_DIR = Path("data/.browser_profile")
+
+# Only the DOM matters for parsing; image URLs are read from attributes
+BLOCKED_RESOURCE_TYPES = {"image", "font", "stylesheet", "media"}
+
+# Statuses bot protection (e.g. Akamai) uses to turn a scraper away
+BLOCKED_STATUSES = {403, 429}
+
+# Like the shared HTTP client, Playwright objects are bound to the event loop
+# that started them, so there is one browser per running loop
+_shared_browsers = weakref.WeakKeyDictionary()
+_browser_locks = weakref.WeakKeyDictionary()
+
+
+async def _route_handler(route):
+    """Abort requests for resources that don't affect the HTML."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def get_browser_context():
+    """Return the browser context shared by all browser scrapers on this loop.
+
+    Chromium is launched on first use and kept open for later scrapes, so the
+    cold start is paid once per run rather than once per page.
+    """
+    loop = asyncio.get_running_loop()
+    lock = _browser_locks.setdefault(loop, asyncio.Lock())
+    async with lock:
+        shared = _shared_browsers.get(loop)
+        if shared is None:
+            playwright = await async_playwright().start()
+            try:
+                BROWSER_PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+                context = await playwright.chromium.launch_persistent_context(
+                    BROWSER_PROFILE_DIR,
+                    headless=True,
+                    user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
+                    viewport={"width": 1920, "height": 1080},
+                )
+                await context.route("**/*", _route_handler)
+            except BaseException:
+                await playwright.stop()
+                raise
+            shared = _shared_browsers[loop] = (playwright, context)
+        return shared[1]
+
+
+async def close_browser_context():
+    """Close the running loop's shared browser, if one was launched."""
+    shared = _shared_browsers.pop(asyncio.get_running_loop(), None)
+    if shared:
+        playwright, context = shared
+        await context.close()
+        await playwright.stop()
+
 
 class BrowserScraper:
     """Base class for browser-based scraping with Playwright."""
 
-    def __init__(self):
+    # Selector that appears once the product grid has rendered
+    PRODUCT_SELECTOR: Optional[str] = None
+
+    def __init__(self, cache: Optional[PageCache] = None):
         if not PLAYWRIGHT_AVAILABLE:
             raise ImportError(
                 "Playwright not installed. Run: pip install playwright && playwright install chromium"
             )
-        self.browser = None
-        self.context = None
-
-    async def _init_browser(self):
-        """Initialize the browser."""
-        self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(headless=True)
-        self.context = await self.browser.new_context(
-            user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
-            viewport={"width": 1920, "height": 1080},
-        )
-
-    async def _close_browser(self):
-        """Close the browser."""
-        if self.context:
-            await self.context.close()
-        if self.browser:
-            await self.browser.close()
-        if hasattr(self, 'playwright'):
-            await self.playwright.stop()
+        self.cache = cache
 
     async def fetch_page(self, url: str, wait_selector: Optional[str] = None) -> Optional[str]:
         """Fetch page content using a real browser."""
+        page = None
         try:
-            page = await self.context.new_page()
-            await page.goto(url, wait_until="networkidle", timeout=30000)
+            context = await get_browser_context()
+            page = await context.new_page()
+            response = await page.goto(url, wait_until="commit", timeout=15000)
 
+            # Bot protection answers with a challenge page; don't parse it or retry
+            if response and response.status in BLOCKED_STATUSES:
+                print(f"Blocked fetching {url} (HTTP {response.status})")
+                return None
+
+            # Wait for the content itself rather than for the network to go
+            # quiet; if it never renders there is nothing worth parsing
             if wait_selector:
-                try:
-                    await page.wait_for_selector(wait_selector, timeout=10000)
-                except Exception:
-                    pass  # Continue even if selector not found
+                await page.wait_for_selector(wait_selector, timeout=10000)
+            else:
+                await page.wait_for_load_state("domcontentloaded")
 
             # Scroll to load lazy content
             await self._scroll_page(page)
 
-            html = await page.content()
-            await page.close()
-            return html
+            return await page.content()
         except Exception as e:
             print(f"Browser error fetching {url}: {e}")
             return None
+        finally:
+            if page:
+                await page.close()
 
-    async def _scroll_page(self, page: Page, scroll_count: int = 3):
+    async def _scroll_page(self, page: Page, scroll_count: int = 2):
         """Scroll page to trigger lazy loading."""
         for _ in range(scroll_count):
             await page.evaluate("window.scrollBy(0, window.innerHeight)")
@@ -80,23 +136,35 @@ class BrowserScraper:
 
     async def scrape_new_arrivals_async(self, debug: bool = False) -> list:
         """Main async method to scrape new arrivals."""
-        await self._init_browser()
-        try:
-            url = self.get_new_arrivals_url()
+        url = self.get_new_arrivals_url()
+        # Check the cache first, so a hit never launches the browser
+        html = self.cache.get(url) if self.cache else None
+        if html is not None:
+            print(f"Using cached page: {url}")
+        else:
             print(f"Fetching (browser): {url}")
-            html = await self.fetch_page(url)
-            if html:
-                if debug:
-                    # Save HTML for debugging
-                    debug_path = f"data/debug_{self.__class__.__name__}.html"
-                    with open(debug_path, "w") as f:
-                        f.write(html)
-                    print(f"Saved debug HTML to {debug_path}")
-                return self.parse_products(html)
-            return []
-        finally:
-            await self._close_browser()
+            html = await self.fetch_page(url, wait_selector=self.PRODUCT_SELECTOR)
+            if html and self.cache:
+                self.cache.set(url, html)
+        if html:
+            if debug:
+                # Save HTML for debugging
+                debug_path = f"data/debug_{self.__class__.__name__}.html"
+                with open(debug_path, "w") as f:
+                    f.write(html)
+                print(f"Saved debug HTML to {debug_path}")
+            return self.parse_products(html)
+        return []
 
     def scrape_new_arrivals(self, debug: bool = False) -> list:
         """Sync wrapper for scraping."""
-        return asyncio.run(self.scrape_new_arrivals_async(debug=debug))
+        async def scrape_and_close():
+            try:
+                return await self.scrape_new_arrivals_async(debug=debug)
+            finally:
+                await close_browser_context()
+
+        return asyncio.run(scrape_and_close())
+
+    def close(self):
+        """No-op: scrapers share a browser, closed by close_browser_context()."""
@@ -0,0 +1,40 @@
+"""On-disk cache of fetched pages so repeated runs don't re-hit retailers."""
+
+import gzip
+import hashlib
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_CACHE_DIR = Path("data/.http_cache")
+DEFAULT_TTL = 3600  # new-arrivals pages don't change minute to minute
+
+
+class PageCache:
+    """Gzipped HTML keyed by URL, considered fresh for ``ttl`` seconds."""
+
+    def __init__(self, directory: Path = DEFAULT_CACHE_DIR, ttl: float = DEFAULT_TTL):
+        self.directory = Path(directory)
+        self.ttl = ttl
+
+    def _path(self, url: str) -> Path:
+        return self.directory / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.html.gz"
+
+    def get(self, url: str) -> Optional[str]:
+        """Return cached HTML for a URL, or None if missing or stale."""
+        path = self._path(url)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl:
+                return None
+            return gzip.decompress(path.read_bytes()).decode("utf-8")
+        except (OSError, EOFError, UnicodeDecodeError):
+            return None
+
+    def set(self, url: str, html: str):
+        """Store HTML for a URL."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(url)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(gzip.compress(html.encode("utf-8")))
+        os.replace(tmp, path)
@@ -0,0 +1,37 @@
+"""Memoized DOM lookups shared by the listing parsers."""
+
+import re
+from typing import Optional
+
+
+class NodeLookup:
+    """Caches per-node queries for a single parsed document.
+
+    Product links in a listing share their ancestors, so the parent walks in
+    ``_parse_product_link`` keep querying the same card and grid containers.
+    Each (node, query) pair is answered once and reused for every link.
+    """
+
+    def __init__(self):
+        self._results = {}
+
+    def css_first(self, node, selector: str):
+        """``node.css_first(selector)``, computed once per node."""
+        key = (node.mem_id, selector)
+        if key not in self._results:
+            self._results[key] = node.css_first(selector)
+        return self._results[key]
+
+    def find_text(self, node, pattern: re.Pattern) -> Optional[str]:
+        """First text node under ``node`` matching ``pattern``, computed once per node."""
+        key = (node.mem_id, pattern)
+        if key not in self._results:
+            self._results[key] = next(
+                (
+                    child.text_content
+                    for child in node.traverse(include_text=True)
+                    if child.tag == "-text" and pattern.search(child.text_content or "")
+                ),
+                None,
+            )
+        return self._results[key]
@@ -1,8 +1,14 @@
 import re
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 from .base import BaseScraper
+from .dom import NodeLookup
 from ..models.product import Product
 
+_PRODUCT_SLUG_RE = re.compile(r'/product/([^/]+)')
+_PRODUCT_COLOR_RE = re.compile(r'/product/[^/]+/([^/?#]+)')
+_SEZANE_X_RE = re.compile(r'\s+Sezane\s+X\s+', re.IGNORECASE)
+_PRICE_STR_RE = re.compile(r'\$\d+')
+
 
 class SezaneScraper(BaseScraper):
     """Scraper for Sezane new arrivals."""
@@ -14,30 +20,32 @@ class SezaneScraper(BaseScraper):
 
     def parse_products(self, html: str) -> list[Product]:
         """Parse Sezane product listings."""
-        soup = BeautifulSoup(html, "lxml")
+        tree = LexborHTMLParser(html)
+        # Local to this parse, so its cached nodes die with the tree
+        lookup = NodeLookup()
         products = []
         seen_urls = set()
 
         # Find all product links - look for unique product URLs
-        product_links = soup.select('a[href*="/product/"]')
+        product_links = tree.css('a[href*="/product/"]')
         print(f"Found {len(product_links)} product links")
 
         for link in product_links:
             try:
-                href = link.get("href", "")
+                href = link.attributes.get("href") or ""
                 if not href or "/product/" not in href:
                     continue
 
                 # Normalize URL - remove fragments (size variants) to deduplicate
                 full_url = href if href.startswith("http") else f"{self.BASE_URL}{href}"
-                base_url = full_url.split('#')[0]  # Remove fragment
+                base_url = full_url.partition('#')[0]  # Remove fragment
 
                 # Skip if already seen this URL
                 if base_url in seen_urls:
                     continue
                 seen_urls.add(base_url)
 
-                product = self._parse_product_link(link, base_url, full_url)
+                product = self._parse_product_link(link, base_url, full_url, lookup)
                 if product:
                     products.append(product)
             except Exception as e:
@@ -47,45 +55,48 @@ class SezaneScraper(BaseScraper):
         print(f"Deduplicated to {len(products)} unique products")
         return products
 
-    def _parse_product_link(self, link, base_url: str, full_url: str) -> Product | None:
+    def _parse_product_link(
+        self, link, base_url: str, full_url: str, lookup: NodeLookup
+    ) -> Product | None:
         """Parse product from link element."""
         # Extract product name from URL path
         # URL pattern: /product/product-name/color
-        match = re.search(r'/product/([^/]+)', base_url)
+        match = _PRODUCT_SLUG_RE.search(base_url)
         if match:
             # Convert URL slug to readable name
             name_slug = match.group(1)
             name = name_slug.replace('-', ' ').title()
             # Clean up common patterns
-            name = re.sub(r'\s+Sezane\s+X\s+', ' × ', name, flags=re.IGNORECASE)
+            name = _SEZANE_X_RE.sub(' × ', name)
         else:
             name = "Unknown"
 
         # Extract color from URL if present (before fragment)
-        color_match = re.search(r'/product/[^/]+/([^/?#]+)', base_url)
+        color_match = _PRODUCT_COLOR_RE.search(base_url)
         colors = [color_match.group(1).replace('-', ' ').title()] if color_match else []
 
         url = base_url  # Use base URL without fragment
 
         # Find image - check the link and its parent containers
-        img = link.find("img")
+        img = link.css_first("img")
         if not img:
             parent = link.parent
             for _ in range(3):  # Check up to 3 levels up
                 if parent:
-                    img = parent.find("img")
+                    img = lookup.css_first(parent, "img")
                     if img:
                         break
                     parent = parent.parent
 
         image_url = ""
         if img:
-            image_url = img.get("src") or img.get("data-src") or ""
+            attrs = img.attributes
+            image_url = attrs.get("src") or attrs.get("data-src") or ""
             # Handle srcset
-            if not image_url and img.get("srcset"):
-                srcset = img.get("srcset", "")
+            if not image_url and attrs.get("srcset"):
+                srcset = attrs["srcset"]
                 # Get first image from srcset
-                image_url = srcset.split(",")[0].split()[0]
+                image_url = srcset.partition(",")[0].split()[0]
             if image_url and not image_url.startswith("http"):
                 image_url = f"https:{image_url}" if image_url.startswith("//") else f"{self.BASE_URL}{image_url}"
 
@@ -94,14 +105,14 @@ class SezaneScraper(BaseScraper):
         parent = link.parent
         for _ in range(4):
             if parent:
-                price_elem = parent.find(string=re.compile(r'\$\d+'))
-                if price_elem:
-                    price = price_elem.strip()
+                price_text = lookup.find_text(parent, _PRICE_STR_RE)
+                if price_text:
+                    price = price_text.strip()
                     break
                 # Also check for price class
-                price_div = parent.select_one('[class*="price"], [class*="Price"]')
+                price_div = lookup.css_first(parent, '[class*="price"], [class*="Price"]')
                 if price_div:
-                    price = price_div.get_text(strip=True)
+                    price = price_div.text(strip=True)
                     break
                 parent = parent.parent
 
@@ -1,4 +1,5 @@
 from .style_analyzer import StyleAnalyzer
 from .product_matcher import ProductMatcher
+from .match_cache import DiskMatchCache
 
-__all__ = ["StyleAnalyzer", "ProductMatcher"]
+__all__ = ["StyleAnalyzer", "ProductMatcher", "DiskMatchCache"]
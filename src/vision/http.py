@@ -0,0 +1,49 @@
+"""Pooled HTTP clients shared by the vision modules."""
+
+from functools import lru_cache
+
+import anthropic
+import httpx
+
+from ..scrapers.base import HTTP2_AVAILABLE
+
+# Matcher workers fetch many images from the same few CDNs; keep those
+# connections open instead of paying a TCP/TLS handshake per image
+MAX_CONNECTIONS = 32
+
+_CLIENT_OPTIONS = dict(
+    timeout=30.0,
+    follow_redirects=True,
+    http2=HTTP2_AVAILABLE,
+    limits=httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_CONNECTIONS,
+        keepalive_expiry=30.0,
+    ),
+    headers={
+        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) Chrome/122.0.0.0"
+    },
+)
+
+# The SDK backs off exponentially with jitter (honouring retry-after) on
+# 429/529 responses; its default of 2 attempts gives up too soon when a
+# whole batch of matching calls hits the rate limit together
+MAX_API_RETRIES = 5
+
+@lru_cache(maxsize=None)
+def get_anthropic_client(api_key: str | None = None) -> anthropic.Anthropic:
+    """Return the process-wide Anthropic client for an API key.
+
+    Style analyses in the web app reuse one connection pool to the API
+    instead of opening a fresh one per upload.
+    """
+    return anthropic.Anthropic(api_key=api_key, max_retries=MAX_API_RETRIES)
+
+
+def new_async_image_client() -> httpx.AsyncClient:
+    """Create a pooled async client for fetching product images.
+
+    Async clients are bound to the event loop that uses them, so each
+    matching run opens (and closes) its own.
+    """
+    return httpx.AsyncClient(**_CLIENT_OPTIONS)
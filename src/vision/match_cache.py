@@ -0,0 +1,69 @@
+"""Persistent cache of product match scores for the command-line tools."""
+
+import sqlite3
+import time
+from collections.abc import Iterator, MutableMapping
+from pathlib import Path
+
+import orjson
+
+DEFAULT_CACHE_PATH = Path("data/.match_cache.sqlite3")
+DEFAULT_TTL = 7 * 86400  # retailers rarely change a listing's photos or copy
+
+
+class DiskMatchCache(MutableMapping[str, dict]):
+    """Match results keyed by ``ProductMatcher.cache_key``, stored in SQLite.
+
+    Plugs into ``ProductMatcher(cache=...)``, so re-running the matcher with
+    an unchanged profile skips the image fetch and Claude call for products
+    scored within the last ``ttl`` seconds.
+    """
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH, ttl: float = DEFAULT_TTL):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self._db = sqlite3.connect(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS matches"
+            " (key TEXT PRIMARY KEY, result TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "DELETE FROM matches WHERE created_at < ?", (time.time() - ttl,)
+        )
+        self._db.commit()
+
+    def __getitem__(self, key: str) -> dict:
+        row = self._db.execute(
+            "SELECT result FROM matches WHERE key = ? AND created_at >= ?",
+            (key, time.time() - self.ttl),
+        ).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return orjson.loads(row[0])
+
+    def __setitem__(self, key: str, value: dict):
+        self._db.execute(
+            "INSERT OR REPLACE INTO matches VALUES (?, ?, ?)",
+            (key, orjson.dumps(value), time.time()),
+        )
+        self._db.commit()
+
+    def __delitem__(self, key: str):
+        if self._db.execute("DELETE FROM matches WHERE key = ?", (key,)).rowcount == 0:
+            raise KeyError(key)
+        self._db.commit()
+
+    def __iter__(self) -> Iterator[str]:
+        rows = self._db.execute(
+            "SELECT key FROM matches WHERE created_at >= ?", (time.time() - self.ttl,)
+        ).fetchall()
+        return (key for (key,) in rows)
+
+    def __len__(self) -> int:
+        return self._db.execute(
+            "SELECT COUNT(*) FROM matches WHERE created_at >= ?", (time.time() - self.ttl,)
+        ).fetchone()[0]
+
+    def close(self):
+        self._db.close()
@@ -1,17 +1,98 @@
 """Match products against a style profile using Claude's vision."""
 
-import base64
+import asyncio
+import hashlib
+import re
 import httpx
 import anthropic
-import json
-from dataclasses import dataclass
-from concurrent.futures import ThreadPoolExecutor, as_completed
-
-from .style_analyzer import StyleProfile
+import orjson
+from collections.abc import Callable, Iterator, MutableMapping
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, replace
+from urllib.parse import urlsplit
+
+from .http import MAX_API_RETRIES, new_async_image_client
+from .style_analyzer import (
+    StyleProfile,
+    downscale_image,
+    encode_image,
+    strip_code_fence,
+)
 from ..models.product import Product
 
+_WORD_RE = re.compile(r"[a-z]{3,}")
+_SEPARATOR_RE = re.compile(r"[^a-z0-9]+")
+
+# Image downloads are cheap next to Claude calls, so allow more of them at once
+MAX_CONCURRENT_FETCHES = 32
+# Score given to products the text pre-filter rejects without a Claude call
+PREFILTER_SCORE = 2
+# Product shots are a few MB at most; anything far larger isn't worth
+# holding in memory across dozens of concurrent downloads
+MAX_IMAGE_BYTES = 20 * 2**20
+# How long a worker holding one ready image waits for others to share its call
+BATCH_LINGER = 0.25
+# Products (images) per Claude call; the API caps images per request, and
+# larger batches mostly buy longer, slower replies
+MAX_BATCH_SIZE = 20
+# Each product's verdict needs well under 500 tokens; the cap keeps big
+# batches within what a non-streaming request may ask for
+TOKENS_PER_PRODUCT = 500
+MAX_OUTPUT_TOKENS = 8192
+
+SYSTEM_PROMPT = """You score fashion products against a shopper's style profile. \
+Each user message shows one or more numbered product images; analyze each one \
+and determine how well it matches the following style profile:
+
+{profile_context}
+
+Return a JSON array with one object per product, in the same order:
+[
+    {{
+        "product": <product number>,
+        "score": <1-10 integer, where 10 is perfect match>,
+        "reasoning": "<2-3 sentences explaining the score>",
+        "style_notes": "<how this piece fits or doesn't fit the aesthetic>",
+        "suggested_pairings": ["<2-3 items from their wardrobe this would pair with>"]
+    }}
+]
+
+Be honest and critical. A score of 7+ means it's a strong match worth buying.
+A score of 5-6 means it could work but isn't ideal.
+Below 5 means it doesn't align well with the style profile.
+
+Return ONLY the JSON array."""
+
+# Everything profile-specific lives in the system prompt; per call, only
+# these small blocks are filled in for each product
+PRODUCT_TEMPLATE = """Product {n}:
+- Name: {name}
+- Price: {price}
+- Colors: {colors}"""
 
-@dataclass
+_SCORE_INSTRUCTION = {
+    "type": "text",
+    "text": "Score each product above against the style profile.",
+}
+
+
+def _terms(*texts: str) -> set[str]:
+    """Lowercase word set used for cheap lexical relevance scoring."""
+    return set(_WORD_RE.findall(" ".join(t for t in texts if t).lower()))
+
+
+def _normalize(*texts: str) -> str:
+    """Lowercase words joined by single spaces and padded with one on each side.
+
+    Padding lets a plain substring test match whole words only, so the
+    phrase " skinny jeans " is found in " black skinny jeans " but " jeans "
+    alone never matches " skinny jeans ".
+    """
+    joined = " ".join(t for t in texts if t).lower()
+    return f" {_SEPARATOR_RE.sub(' ', joined).strip()} "
+
+
+@dataclass(slots=True)
 class MatchResult:
     """Result of matching a product against a style profile."""
 
@@ -34,36 +115,99 @@ class MatchResult:
 class ProductMatcher:
     """Matches products against a style profile using vision analysis."""
 
-    def __init__(self, style_profile: StyleProfile, api_key: str | None = None):
+    def __init__(
+        self,
+        style_profile: StyleProfile,
+        api_key: str | None = None,
+        cache: MutableMapping[str, dict] | None = None,
+    ):
         self.profile = style_profile
-        self.client = anthropic.Anthropic(api_key=api_key)
-        self.http_client = httpx.Client(
-            timeout=30.0,
-            headers={
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) Chrome/122.0.0.0"
-            }
+        # Maps cache_key(product) -> scoring fields of a previous MatchResult
+        self.cache = cache
+        self.api_key = api_key
+        # Image hosts Claude couldn't download from; their images are uploaded
+        self._upload_hosts: set[str] = set()
+        # Outcome of the latest iter_matches()/match_products() run: products
+        # that got a score, and those that couldn't be analyzed (bad image,
+        # API error) and would get one on a retry
+        self.products_scored = 0
+        self.products_unscored = 0
+        p = style_profile
+        self._profile_terms = _terms(
+            *p.color_palette, *p.preferred_styles, *p.silhouettes,
+            *p.patterns, *p.materials, *p.aesthetics,
         )
-
-    def _fetch_image(self, url: str) -> tuple[str, str] | None:
-        """Fetch image from URL and return base64 data and media type."""
+        self._avoid_terms = _terms(*p.avoid)
+        # Whole phrases for the pre-filter; single words are too broad to
+        # reject on ("jeans" from "skinny jeans" would catch every pair)
+        self._avoid_phrases = [
+            phrase for phrase in (_normalize(a) for a in p.avoid) if phrase.strip()
+        ]
+        # Identical for every call in a run, so Claude can serve it from its
+        # prompt cache instead of re-reading it per batch
+        self._system_prompt = [{
+            "type": "text",
+            "text": SYSTEM_PROMPT.format(profile_context=self._build_profile_context()),
+            "cache_control": {"type": "ephemeral"},
+        }]
+        self._profile_hash = hashlib.blake2b(
+            orjson.dumps(p.to_dict(), option=orjson.OPT_SORT_KEYS), digest_size=16
+        ).digest()
+
+    def cache_key(self, product: Product) -> str:
+        """Key identifying a product's match against this exact profile."""
+        h = hashlib.blake2b(self._profile_hash, digest_size=16)
+        for value in (product.url, product.name, product.image_url, product.description):
+            h.update(b"\0" + (value or "").encode("utf-8"))
+        return h.hexdigest()
+
+    async def _fetch_image(
+        self, http: httpx.AsyncClient, slots: asyncio.Semaphore, url: str
+    ) -> dict | None:
+        """Fetch image from URL and return it as a base64 image source."""
         try:
-            response = self.http_client.get(url, follow_redirects=True)
-            response.raise_for_status()
-
-            content_type = response.headers.get("content-type", "image/jpeg")
-            if ";" in content_type:
-                content_type = content_type.split(";")[0]
-
-            # Validate it's actually an image
-            if not content_type.startswith("image/"):
-                return None
-
-            data = base64.standard_b64encode(response.content).decode("utf-8")
-            return data, content_type
+            async with slots, http.stream("GET", url) as response:
+                response.raise_for_status()
+
+                content_type = response.headers.get("content-type", "image/jpeg")
+                if ";" in content_type:
+                    content_type = content_type.split(";")[0]
+
+                # Validate it's actually an image before downloading the body
+                if not content_type.startswith("image/"):
+                    return None
+
+                # Stop reading oversized bodies instead of buffering them whole
+                body = bytearray()
+                async for chunk in response.aiter_bytes():
+                    body += chunk
+                    if len(body) > MAX_IMAGE_BYTES:
+                        print(f"Skipping image over {MAX_IMAGE_BYTES // 2**20} MB: {url}")
+                        return None
+
+            # Decoding and resizing would stall the event loop, and Pillow
+            # releases the GIL while doing it
+            raw, content_type = await asyncio.to_thread(
+                downscale_image, body, content_type
+            )
+            return {"type": "base64", "media_type": content_type, "data": encode_image(raw)}
         except Exception as e:
             print(f"Error fetching image: {e}")
             return None
 
+    async def _image_source(
+        self, http: httpx.AsyncClient, slots: asyncio.Semaphore, product: Product
+    ) -> dict | None:
+        """Image source for a product's picture.
+
+        Claude downloads images itself when given their URL, which saves
+        fetching, encoding and re-uploading every photo; hosts it couldn't
+        reach earlier in the run get the bytes uploaded instead.
+        """
+        if urlsplit(product.image_url).hostname not in self._upload_hosts:
+            return {"type": "url", "url": product.image_url}
+        return await self._fetch_image(http, slots, product.image_url)
+
     def _build_profile_context(self) -> str:
         """Build a text description of the style profile for the prompt."""
         p = self.profile
@@ -88,119 +232,384 @@ class ProductMatcher:
 
         return "\n".join(parts)
 
-    def match_product(self, product: Product) -> MatchResult | None:
-        """Match a single product against the style profile."""
-        if not product.image_url:
-            return None
-
-        image_data = self._fetch_image(product.image_url)
-        if not image_data:
-            return None
+    @staticmethod
+    def _product_terms(product: Product) -> set[str]:
+        return _terms(
+            product.name, product.category or "", product.description or "",
+            *product.colors,
+        )
 
-        data, media_type = image_data
-        profile_context = self._build_profile_context()
-
-        content = [
-            {
-                "type": "image",
-                "source": {
-                    "type": "base64",
-                    "media_type": media_type,
-                    "data": data,
-                },
-            },
-            {
-                "type": "text",
-                "text": f"""Analyze this product image and determine how well it matches the following style profile:
+    def relevance(self, product: Product) -> int:
+        """Cheap text relevance of a product to the profile (no API call)."""
+        terms = self._product_terms(product)
+        return len(terms & self._profile_terms) - len(terms & self._avoid_terms)
+
+    def _cheap_prefilter(self, product: Product) -> int | None:
+        """Score obvious rejects without an API call, else None.
+
+        A product whose name, colors or description contains a whole phrase
+        from the profile's avoid list is scored PREFILTER_SCORE; anything else
+        is left for Claude to judge.
+        """
+        text = _normalize(product.name, *product.colors, product.description or "")
+        if any(phrase in text for phrase in self._avoid_phrases):
+            return PREFILTER_SCORE
+        return None
+
+    def rank_products(self, products: list[Product]) -> list[Product]:
+        """Order products by text relevance, keeping scrape order for ties."""
+        return sorted(products, key=self.relevance, reverse=True)
+
+    def _result_from_cache(self, product: Product, key: str) -> MatchResult:
+        cached = self.cache[key]
+        return MatchResult(
+            product=product,
+            score=cached["score"],
+            reasoning=cached["reasoning"],
+            style_notes=cached["style_notes"],
+            suggested_pairings=cached["suggested_pairings"],
+        )
 
-{profile_context}
+    def match_product(self, product: Product) -> MatchResult | None:
+        """Match a single product against the style profile."""
+        return self.match_product_batch([product])[0]
+
+    def match_product_batch(self, products: list[Product]) -> list[MatchResult | None]:
+        """Match several products, up to MAX_BATCH_SIZE per Claude call.
+
+        Returns one entry per input product, in order; None where the product
+        has no usable image or could not be scored.
+        """
+        return asyncio.run(self._match_batch_async(products))
+
+    @asynccontextmanager
+    async def _open_clients(self):
+        """Anthropic and image clients for one run on the current event loop."""
+        async with (
+            anthropic.AsyncAnthropic(api_key=self.api_key, max_retries=MAX_API_RETRIES) as client,
+            new_async_image_client() as http,
+        ):
+            yield client, http
+
+    def _lookup_cache(self, product: Product) -> tuple[str | None, MatchResult | None]:
+        """Return the product's cache key and its cached result, if any."""
+        if self.cache is None:
+            return None, None
+        key = self.cache_key(product)
+        if key in self.cache:
+            return key, self._result_from_cache(product, key)
+        return key, None
+
+    async def _match_batch_async(self, products: list[Product]) -> list[MatchResult | None]:
+        results: list[MatchResult | None] = [None] * len(products)
+
+        # Serve cache hits and fetch images for everything else
+        to_fetch = []
+        for i, product in enumerate(products):
+            if not product.image_url:
+                continue
+            key, results[i] = self._lookup_cache(product)
+            if results[i] is None:
+                to_fetch.append((i, key))
+        if not to_fetch:
+            return results
+
+        async with self._open_clients() as (client, http):
+            fetch_slots = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+            sources = await asyncio.gather(*(
+                self._image_source(http, fetch_slots, products[i])
+                for i, _ in to_fetch
+            ))
+            pending = [
+                (i, (products[i], key, source))
+                for (i, key), source in zip(to_fetch, sources) if source
+            ]
+            for start in range(0, len(pending), MAX_BATCH_SIZE):
+                chunk = pending[start:start + MAX_BATCH_SIZE]
+                scored = await self._score_batch(
+                    client, http, fetch_slots, [item for _, item in chunk]
+                )
+                for (i, _), result in zip(chunk, scored):
+                    results[i] = result
 
-Product Info:
-- Name: {product.name}
-- Price: {product.price}
-- Colors: {', '.join(product.colors) if product.colors else 'Not specified'}
+        return results
 
-Return a JSON object with:
-{{
-    "score": <1-10 integer, where 10 is perfect match>,
-    "reasoning": "<2-3 sentences explaining the score>",
-    "style_notes": "<how this piece fits or doesn't fit the aesthetic>",
-    "suggested_pairings": ["<2-3 items from their wardrobe this would pair with>"]
-}}
+    async def _match_pipeline(
+        self,
+        products: list[Product],
+        batch_size: int,
+        max_workers: int,
+        on_batch: Callable[[list[Product], list[MatchResult | None]], None],
+    ):
+        """Prepare images and score them as two overlapping stages.
+
+        Image sources are queued as soon as they are ready (URLs immediately,
+        uploads once downloaded, bounded by MAX_CONCURRENT_FETCHES);
+        ``max_workers`` consumers batch up whatever has arrived and send it to
+        Claude. A slow CDN only delays its own product instead of holding up a
+        whole pre-formed batch.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        to_fetch = []
+        for product in products:
+            key, cached = self._lookup_cache(product)
+            if cached:
+                on_batch([product], [cached])
+            else:
+                to_fetch.append((product, key))
+        if not to_fetch:
+            return
+
+        async with self._open_clients() as (client, http):
+            fetch_slots = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+
+            async def fetch(product: Product, key: str | None):
+                source = None
+                if product.image_url:
+                    source = await self._image_source(http, fetch_slots, product)
+                if source:
+                    await queue.put((product, key, source))
+                else:
+                    on_batch([product], [None])
+
+            async def produce():
+                await asyncio.gather(*(fetch(product, key) for product, key in to_fetch))
+                for _ in range(max_workers):
+                    await queue.put(None)
+
+            async def consume():
+                while True:
+                    item = await queue.get()
+                    if item is None:
+                        return
+                    batch = [item]
+                    # Give images still in flight a moment to join this call
+                    deadline = asyncio.get_running_loop().time() + BATCH_LINGER
+                    while len(batch) < batch_size:
+                        try:
+                            async with asyncio.timeout_at(deadline):
+                                item = await queue.get()
+                        except TimeoutError:
+                            break
+                        if item is None:
+                            queue.put_nowait(None)  # leave it for this worker's next get
+                            break
+                        batch.append(item)
+
+                    try:
+                        scored = await self._score_batch(client, http, fetch_slots, batch)
+                    except Exception as e:
+                        scored = [None] * len(batch)
+                        print(f"  Error matching batch: {e}")
+                    on_batch([product for product, _, _ in batch], scored)
+
+            await asyncio.gather(produce(), *(consume() for _ in range(max_workers)))
+
+    async def _score_batch(
+        self,
+        client: anthropic.AsyncAnthropic,
+        http: httpx.AsyncClient,
+        slots: asyncio.Semaphore,
+        items: list[tuple[Product, str | None, dict]],
+    ) -> list[MatchResult | None]:
+        """Score items, uploading the images if Claude couldn't fetch them."""
+        try:
+            return await self._score_images(client, items)
+        except anthropic.BadRequestError:
+            pass
+
+        # The error doesn't say which image failed, so upload the whole batch
+        hosts = {urlsplit(product.image_url).hostname for product, _, _ in items}
+        if not hosts <= self._upload_hosts:
+            print(f"  Claude could not fetch images from {', '.join(sorted(hosts))}; uploading them")
+            self._upload_hosts |= hosts
+        sources = await asyncio.gather(*(
+            self._fetch_image(http, slots, product.image_url) for product, _, _ in items
+        ))
+        retry = [i for i, source in enumerate(sources) if source]
+        results: list[MatchResult | None] = [None] * len(items)
+        if retry:
+            scored = await self._score_images(
+                client, [(items[i][0], items[i][1], sources[i]) for i in retry]
+            )
+            for i, result in zip(retry, scored):
+                results[i] = result
+        return results
 
-Be honest and critical. A score of 7+ means it's a strong match worth buying.
-A score of 5-6 means it could work but isn't ideal.
-Below 5 means it doesn't align well with the style profile.
+    async def _score_images(
+        self,
+        client: anthropic.AsyncAnthropic,
+        items: list[tuple[Product, str | None, dict]],
+    ) -> list[MatchResult | None]:
+        """Score ``(product, cache_key, image source)`` items in one Claude call.
+
+        Raises ``anthropic.BadRequestError`` if the request used image URLs
+        and was rejected, so the caller can retry with uploaded images.
+        """
+        results: list[MatchResult | None] = [None] * len(items)
+
+        content = []
+        for n, (product, _, source) in enumerate(items, 1):
+            content.append({"type": "image", "source": source})
+            content.append({
+                "type": "text",
+                "text": PRODUCT_TEMPLATE.format(
+                    n=n,
+                    name=product.name,
+                    price=product.price,
+                    colors=", ".join(product.colors) if product.colors else "Not specified",
+                ),
+            })
 
-Return ONLY the JSON object."""
-            }
-        ]
+        content.append(_SCORE_INSTRUCTION)
 
+        names = ", ".join(product.name for product, _, _ in items)
         try:
-            response = self.client.messages.create(
+            response = await client.messages.create(
                 model="claude-sonnet-4-20250514",
-                max_tokens=500,
+                max_tokens=min(TOKENS_PER_PRODUCT * len(items), MAX_OUTPUT_TOKENS),
+                system=self._system_prompt,
                 messages=[{"role": "user", "content": content}]
             )
 
-            response_text = response.content[0].text
-            # Clean up markdown
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0]
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0]
-
-            result = json.loads(response_text.strip())
-
-            return MatchResult(
+            parsed = orjson.loads(strip_code_fence(response.content[0].text))
+            if isinstance(parsed, dict):
+                parsed = [parsed]
+        except Exception as e:
+            if isinstance(e, anthropic.BadRequestError) and any(
+                source["type"] == "url" for _, _, source in items
+            ):
+                raise
+            print(f"Error matching products {names}: {e}")
+            return results
+
+        for n, result in enumerate(parsed, 1):
+            if not isinstance(result, dict):
+                continue
+            number = result.get("product", n)
+            if not isinstance(number, int) or not 1 <= number <= len(items):
+                continue
+            # Scores are compared and sorted later; "7" or 7.0 still count,
+            # anything that isn't a number leaves the product unscored
+            try:
+                score = int(result.get("score", 0))
+            except (TypeError, ValueError):
+                continue
+            product, key, _ = items[number - 1]
+            match = results[number - 1] = MatchResult(
                 product=product,
-                score=result.get("score", 0),
+                score=score,
                 reasoning=result.get("reasoning", ""),
                 style_notes=result.get("style_notes", ""),
                 suggested_pairings=result.get("suggested_pairings", []),
             )
-        except Exception as e:
-            print(f"Error matching product {product.name}: {e}")
-            return None
+            if key is not None:
+                self.cache[key] = {
+                    "score": match.score,
+                    "reasoning": match.reasoning,
+                    "style_notes": match.style_notes,
+                    "suggested_pairings": match.suggested_pairings,
+                }
 
-    def match_products(
+        return results
+
+    def iter_matches(
         self,
         products: list[Product],
         min_score: int = 0,
         max_workers: int = 3,
         limit: int | None = None,
-    ) -> list[MatchResult]:
-        """Match multiple products in parallel, filtering by minimum score."""
+        batch_size: int = 8,
+    ) -> Iterator[MatchResult]:
+        """Yield matches scoring at least ``min_score`` as their batches finish.
+
+        Images are passed to Claude by URL where possible and scored up to
+        ``batch_size`` per Claude call, with at most ``max_workers`` calls in
+        flight. Closing the generator early cancels the remaining calls.
+        """
         # Filter to products with images
         products_with_images = [p for p in products if p.image_url]
 
+        # Products that could never reach min_score aren't worth a Claude call
+        if min_score > PREFILTER_SCORE:
+            kept = [p for p in products_with_images if self._cheap_prefilter(p) is None]
+            skipped = len(products_with_images) - len(kept)
+            if skipped:
+                print(f"Skipping {skipped} products matching the avoid list")
+            products_with_images = kept
+
+        # Colour and size variants often share a photo; score each image once
+        # and give every variant the same result
+        variants: dict[str, list[Product]] = {}
+        for product in products_with_images:
+            variants.setdefault(product.image_url, []).append(product)
+        products_with_images = [group[0] for group in variants.values()]
+
+        # Spend the API budget on the most promising products first
         if limit:
-            products_with_images = products_with_images[:limit]
-
-        print(f"Matching {len(products_with_images)} products against style profile...")
-
-        results = []
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_product = {
-                executor.submit(self.match_product, p): p
-                for p in products_with_images
-            }
-
-            for i, future in enumerate(as_completed(future_to_product)):
-                product = future_to_product[future]
-                try:
-                    result = future.result()
+            products_with_images = self.rank_products(products_with_images)[:limit]
+
+        batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+        total = sum(len(variants[p.image_url]) for p in products_with_images)
+        print(f"Matching {total} products against style profile...")
+        self.products_scored = self.products_unscored = 0
+
+        ready: asyncio.Queue = asyncio.Queue()
+        done = 0
+
+        def report(batch: list[Product], batch_results: list[MatchResult | None]):
+            nonlocal done
+            lines = []
+            for scored, scored_result in zip(batch, batch_results):
+                for product in variants[scored.image_url]:
+                    result = scored_result and replace(scored_result, product=product)
+                    done += 1
+                    if result:
+                        self.products_scored += 1
+                    else:
+                        self.products_unscored += 1
                     if result and result.score >= min_score:
-                        results.append(result)
-                        print(f"  [{i+1}/{len(products_with_images)}] {product.name}: {result.score}/10")
+                        ready.put_nowait(result)
+                        lines.append(f"  [{done}/{total}] {product.name}: {result.score}/10")
                     elif result:
-                        print(f"  [{i+1}/{len(products_with_images)}] {product.name}: {result.score}/10 (below threshold)")
+                        lines.append(
+                            f"  [{done}/{total}] {product.name}: {result.score}/10 (below threshold)"
+                        )
                     else:
-                        print(f"  [{i+1}/{len(products_with_images)}] {product.name}: Could not analyze")
-                except Exception as e:
-                    print(f"  [{i+1}/{len(products_with_images)}] {product.name}: Error - {e}")
+                        lines.append(f"  [{done}/{total}] {product.name}: Could not analyze")
+            # One write per batch rather than per product
+            print("\n".join(lines))
+
+        async def run():
+            try:
+                await self._match_pipeline(
+                    products_with_images, batch_size, max_workers, on_batch=report
+                )
+            finally:
+                ready.put_nowait(None)
+
+        # Drive the loop only until the next result is ready, so the caller
+        # gets it while later batches are still in flight; leaving the
+        # runner cancels whatever is left
+        with asyncio.Runner() as runner:
+            pipeline = runner.get_loop().create_task(run())
+            while (result := runner.run(ready.get())) is not None:
+                yield result
+            pipeline.result()
+
+    def match_products(
+        self,
+        products: list[Product],
+        min_score: int = 0,
+        max_workers: int = 3,
+        limit: int | None = None,
+        batch_size: int = 8,
+    ) -> list[MatchResult]:
+        """Match multiple products concurrently, filtering by minimum score.
 
-        # Sort by score descending
+        Returns every match from ``iter_matches``, best score first.
+        """
+        results = list(self.iter_matches(products, min_score, max_workers, limit, batch_size))
         results.sort(key=lambda r: r.score, reverse=True)
         return results
 
@@ -211,5 +620,13 @@ Return ONLY the JSON object."""
         min_score: int = 6,
     ) -> list[MatchResult]:
         """Get the top N matching products above a minimum score."""
-        results = self.match_products(products, min_score=min_score)
+        results = []
+        perfect = 0
+        for result in self.iter_matches(products, min_score=min_score):
+            results.append(result)
+            perfect += result.score >= 10
+            # Nothing left can outrank top_n perfect scores
+            if perfect >= top_n:
+                break
+        results.sort(key=lambda r: r.score, reverse=True)
         return results[:top_n]
@@ -1,14 +1,87 @@
 """Analyze style profile images to extract aesthetic preferences."""
 
 import base64
-import httpx
+import io
+import re
 from pathlib import Path
 from dataclasses import dataclass, field
-import anthropic
-import json
+import orjson
+from PIL import Image, ImageOps
 
+try:
+    import pybase64
+    PYBASE64_AVAILABLE = True
+except ImportError:
+    PYBASE64_AVAILABLE = False
 
-@dataclass
+from .http import get_anthropic_client
+
+# Summary of the placeholder profile returned when Claude's reply can't be parsed
+PARSE_FAILED_SUMMARY = "Could not parse style profile"
+
+# Claude sometimes wraps JSON replies in a markdown code fence
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)\s*```", re.DOTALL)
+
+MEDIA_TYPES = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+}
+
+# Claude downsamples anything with a longer edge than this, so larger
+# images only cost upload bandwidth
+MAX_IMAGE_EDGE = 1568
+
+
+def downscale_image(data: bytes, media_type: str) -> tuple[bytes, str]:
+    """Shrink an image to MAX_IMAGE_EDGE on its long edge, re-encoded as JPEG.
+
+    Images that are already small enough (or can't be decoded) are returned
+    unchanged.
+    """
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            if max(img.size) <= MAX_IMAGE_EDGE:
+                return data, media_type
+            # Phone photos store rotation in EXIF, which re-encoding drops
+            img = ImageOps.exif_transpose(img)
+            # JPEG has no alpha, and a plain RGB conversion turns transparent
+            # backgrounds (product cut-outs) black; flatten onto white instead
+            if img.mode in ("RGBA", "LA", "PA") or "transparency" in img.info:
+                img = img.convert("RGBA")
+                flat = Image.new("RGB", img.size, "white")
+                flat.paste(img, mask=img.getchannel("A"))
+                img = flat
+            else:
+                img = img.convert("RGB")
+            img.thumbnail((MAX_IMAGE_EDGE, MAX_IMAGE_EDGE), Image.LANCZOS)
+            buf = io.BytesIO()
+            img.save(buf, "JPEG", quality=85)
+    except (OSError, Image.DecompressionBombError):
+        return data, media_type
+    return buf.getvalue(), "image/jpeg"
+
+
+def strip_code_fence(text: str) -> str:
+    """Return the contents of the first markdown code fence, or the text itself."""
+    match = _FENCE_RE.search(text)
+    return match.group(1) if match else text.strip()
+
+
+def encode_image(data: bytes) -> str:
+    """Base64-encode image bytes for an API image block.
+
+    Uses pybase64's SIMD encoder when installed, which is an order of
+    magnitude faster than the stdlib on multi-megabyte images.
+    """
+    if PYBASE64_AVAILABLE:
+        return pybase64.b64encode_as_string(data)
+    return base64.standard_b64encode(data).decode("ascii")
+
+
+@dataclass(slots=True)
 class StyleProfile:
     """Represents extracted style preferences from user images."""
 
@@ -35,48 +108,21 @@ class StyleProfile:
 
     @classmethod
     def from_dict(cls, data: dict) -> "StyleProfile":
-        return cls(**data)
+        # Saved profiles may carry extra bookkeeping, e.g. images_digest
+        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
 
 
 class StyleAnalyzer:
     """Analyzes images to build a style profile using Claude's vision."""
 
     def __init__(self, api_key: str | None = None):
-        self.client = anthropic.Anthropic(api_key=api_key)
-        self.http_client = httpx.Client(timeout=30.0)
+        self.client = get_anthropic_client(api_key)
 
     def _load_image(self, path: Path) -> tuple[str, str]:
         """Load image and return base64 data and media type."""
-        suffix = path.suffix.lower()
-        media_types = {
-            ".jpg": "image/jpeg",
-            ".jpeg": "image/jpeg",
-            ".png": "image/png",
-            ".gif": "image/gif",
-            ".webp": "image/webp",
-        }
-        media_type = media_types.get(suffix, "image/jpeg")
-
-        with open(path, "rb") as f:
-            data = base64.standard_b64encode(f.read()).decode("utf-8")
-
-        return data, media_type
-
-    def _fetch_image_url(self, url: str) -> tuple[str, str] | None:
-        """Fetch image from URL and return base64 data and media type."""
-        try:
-            response = self.http_client.get(url, follow_redirects=True)
-            response.raise_for_status()
-
-            content_type = response.headers.get("content-type", "image/jpeg")
-            if ";" in content_type:
-                content_type = content_type.split(";")[0]
-
-            data = base64.standard_b64encode(response.content).decode("utf-8")
-            return data, content_type
-        except Exception as e:
-            print(f"Error fetching image {url}: {e}")
-            return None
+        media_type = MEDIA_TYPES.get(path.suffix.lower(), "image/jpeg")
+        raw, media_type = downscale_image(path.read_bytes(), media_type)
+        return encode_image(raw), media_type
 
     def analyze_style_images(self, image_paths: list[Path]) -> StyleProfile:
         """Analyze multiple style reference images to build a profile."""
@@ -132,26 +178,26 @@ Return ONLY the JSON object, no other text."""
 
         # Parse response
         response_text = response.content[0].text
-        # Clean up potential markdown formatting
-        if "```json" in response_text:
-            response_text = response_text.split("```json")[1].split("```")[0]
-        elif "```" in response_text:
-            response_text = response_text.split("```")[1].split("```")[0]
 
         try:
-            data = json.loads(response_text.strip())
+            data = orjson.loads(strip_code_fence(response_text))
             return StyleProfile.from_dict(data)
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             print(f"Error parsing style profile: {e}")
             print(f"Response was: {response_text}")
-            return StyleProfile(summary="Could not parse style profile")
+            return StyleProfile(summary=PARSE_FAILED_SUMMARY)
+
+    def save_profile(self, profile: StyleProfile, path: Path, images_digest: str | None = None):
+        """Save style profile to JSON file.
 
-    def save_profile(self, profile: StyleProfile, path: Path):
-        """Save style profile to JSON file."""
-        with open(path, "w") as f:
-            json.dump(profile.to_dict(), f, indent=2)
+        ``images_digest`` identifies the reference images the profile was
+        built from, so a later run can tell whether this file is still theirs.
+        """
+        data = profile.to_dict()
+        if images_digest:
+            data["images_digest"] = images_digest
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
 
     def load_profile(self, path: Path) -> StyleProfile:
         """Load style profile from JSON file."""
-        with open(path) as f:
-            return StyleProfile.from_dict(json.load(f))
+        return StyleProfile.from_dict(orjson.loads(path.read_bytes()))